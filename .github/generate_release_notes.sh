@@ -36,15 +36,8 @@ EXIT_CODE=$?
 # Lösche temporäre Datei
 rm $COMMITS_FILE
 
-# Kopiere release-notes.json in public Verzeichnis
-if [ -f "release-notes.json" ]; then
-    mkdir -p public
-    cp release-notes.json public/
-    echo "✅ release-notes.json wurde in public/ kopiert"
-else
-    echo "❌ release-notes.json wurde nicht gefunden"
-    exit 1
-fi
+# Der Release Manager schreibt release-notes/ und public/release-notes/ selbst,
+# ein Kopieren ist nicht mehr nötig
 
 # Gib Erfolg oder Fehler zurück
 if [ $EXIT_CODE -eq 0 ]; then
@@ -2,18 +2,220 @@
 import os
 import sys
 import json
+import re
+import html
+import time
+import random
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import openai
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+# Append-only-Speicher: ein JSON-Datensatz pro Zeile, älteste Version zuerst
+STORE_DIR = 'release-notes'
+RECORDS_FILE = os.path.join(STORE_DIR, 'records.jsonl')
+INDEX_FILE = os.path.join(STORE_DIR, 'index.json')
+
+# Öffentliche Abschnitte für die Release-Notes-Seite
+PUBLIC_DIR = os.path.join('public', 'release-notes')
+LATEST_COUNT = 20
+
+# Invertierter Suchindex (Token -> IDs der Versionen) für die Release-Notes-Seite
+SEARCH_TOKEN = re.compile(r'\w+')
+MIN_TOKEN_LENGTH = 2
+# Wörtlich gespeicherte JSON-/Python-Escapes wie \u00e4 in alten Release Notes
+UNICODE_ESCAPE = re.compile(r'\\u[0-9a-fA-F]{4}')
+
+# OpenAI-Zusammenfassung nicht klassifizierter Commits
+OPENAI_MODEL = "gpt-4-turbo-preview"
+CHUNK_TOKEN_BUDGET = 1500      # geschätzte Prompt-Tokens je Anfrage
+MAX_CONCURRENT_REQUESTS = 4
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0         # Sekunden, verdoppelt sich je Versuch
+CACHE_DIR = os.getenv('RELEASE_CACHE_DIR', '.release-cache')
+
+# SHA am Zeilenanfang aus git log --pretty=format:"%H %s (%an)"
+COMMIT_SHA = re.compile(r'^(?P<sha>[0-9a-f]{40})\s+(?P<subject>.*)$')
+
+# Conventional Commits: typ(scope)!: beschreibung
+CONVENTIONAL_COMMIT = re.compile(r'^(?P<type>[a-zA-Z]+)(?:\((?P<scope>[^)]*)\))?(?P<breaking>!)?:\s*(?P<description>\S.*)$')
+# Autor am Zeilenende aus git log --pretty=format:"%s (%an)"
+AUTHOR_SUFFIX = re.compile(r'\s+\([^()#]*\)\s*$')
+BREAKING_MARKER = re.compile(r'BREAKING[ -]CHANGE', re.IGNORECASE)
+
+# Typen nach Conventional Commits; andere Präfixe ("Feature:", "WIP:") entscheidet OpenAI
+CONVENTIONAL_TYPES = {'feat', 'fix', 'perf', 'refactor', 'docs', 'test', 'build', 'ci', 'chore', 'style', 'revert'}
+
+# Commit-Typ -> Stufe der Versionserhöhung
+BUMP_LEVELS = {'major': 3, 'minor': 2, 'patch': 1}
+TYPE_BUMPS = {'feat': 'minor'}
+
+# Reihenfolge und Überschrift der Gruppen in den Release Notes
+CHANGE_GROUPS = [
+    ('breaking', 'Breaking Change'),
+    ('feat', 'Neu'),
+    ('fix', 'Fehlerbehebung'),
+    ('perf', 'Performance'),
+    ('refactor', 'Refactoring'),
+    ('docs', 'Dokumentation'),
+    ('test', 'Tests'),
+    ('other', 'Wartung'),
+]
+
+
+def parse_commit(line: str) -> Optional[Dict]:
+    """Klassifiziert eine Commit-Zeile; None, wenn sie nicht eindeutig ist"""
+    subject = AUTHOR_SUFFIX.sub('', line.strip())
+    breaking = bool(BREAKING_MARKER.search(subject))
+
+    match = CONVENTIONAL_COMMIT.match(subject)
+    if match:
+        commit_type = match.group('type').lower()
+        if commit_type not in CONVENTIONAL_TYPES:
+            return None
+        description = match.group('description')
+        breaking = breaking or bool(match.group('breaking'))
+    elif breaking:
+        # Ohne Präfix ist nur ein BREAKING-CHANGE-Vermerk eindeutig
+        commit_type = 'other'
+        description = subject
+    else:
+        return None
+
+    description = BREAKING_MARKER.sub('', description).strip(' :-')
+    if not description:
+        return None
+    return {
+        "type": commit_type,
+        "breaking": breaking,
+        "bump": 'major' if breaking else TYPE_BUMPS.get(commit_type, 'patch'),
+        "description": description[0].upper() + description[1:],
+    }
+
+
+def split_commit(line: str) -> Tuple[str, str]:
+    """Trennt den SHA vom Betreff; ohne SHA dient ein Hash der Zeile als Schlüssel"""
+    line = line.strip()
+    match = COMMIT_SHA.match(line)
+    if match:
+        return match.group('sha'), match.group('subject')
+    return hashlib.sha1(line.encode('utf-8')).hexdigest(), line
+
+
+def estimate_tokens(text: str) -> int:
+    """Grobe Schätzung (etwa 4 Zeichen pro Token), genügt für die Aufteilung"""
+    return len(text) // 4 + 1
+
+
+def chunk_commits(commits: List[Tuple[str, str]], budget: int = CHUNK_TOKEN_BUDGET) -> List[List[Tuple[str, str]]]:
+    """Teilt (SHA, Betreff)-Paare in Abschnitte, deren Betreffe zusammen das Token-Budget einhalten.
+
+    Die Aufteilung beginnt beim ältesten Commit, damit bei neu
+    hinzugekommenen Commits die bisherigen Abschnitte und damit ihre
+    Cache-Einträge unverändert bleiben.
+    """
+    chunks: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+    for sha, subject in reversed(commits):
+        tokens = estimate_tokens(subject)
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append((sha, subject))
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def is_release_noise(line: str) -> bool:
+    """Automatische Versions-Commits und Merges erscheinen nicht in den Release Notes"""
+    subject = line.strip()
+    return not subject or '#auto-release' in subject or subject.startswith('Merge ')
+
+
+def bump_version(version: str, level: str) -> str:
+    """Erhöht MAJOR.MINOR.PATCH gemäß Semantic Versioning"""
+    major, minor, patch = (int(part) for part in version.split('.')[:3])
+    if level == 'major':
+        return f"{major + 1}.0.0"
+    if level == 'minor':
+        return f"{major}.{minor + 1}.0"
+    return f"{major}.{minor}.{patch + 1}"
+
+
+def group_changes(classified: List[Dict]) -> List[str]:
+    """Sortiert klassifizierte Commits nach Gruppe, innerhalb einer Gruppe in Commit-Reihenfolge"""
+    labels = dict(CHANGE_GROUPS)
+    order = [key for key, _ in CHANGE_GROUPS]
+    changes = []
+    for key in order:
+        for commit in classified:
+            group = 'breaking' if commit["breaking"] else commit["type"]
+            if group not in labels:
+                group = 'other'
+            if group == key:
+                changes.append(f"{labels[key]}: {commit['description']}")
+    return changes
+
+
+def release_year(record: Dict) -> str:
+    """Jahr aus dem Datum (TT.MM.JJJJ) eines Datensatzes"""
+    return record["date"].rsplit('.', 1)[-1]
+
+
+def normalize_text(text: str) -> str:
+    """Ersetzt HTML-Entities (z.B. &#252;) und wörtliche Escapes (z.B. \\u00fc) durch die UTF-8-Zeichen"""
+    text = html.unescape(text)
+    text = UNICODE_ESCAPE.sub(lambda match: chr(int(match.group(0)[2:], 16)), text)
+    # Ersatzzeichenpaare aus \\ud83d\\ude80 zu einem Zeichen zusammenfassen
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
+
+def normalize_changes(changes: List[str]) -> List[str]:
+    return [normalize_text(change).strip() for change in changes]
+
+
+def search_tokens(record: Dict) -> List[str]:
+    """Suchbegriffe einer Version: Wörter der Änderungen in Kleinschreibung und die Versionsnummer"""
+    text = ' '.join(record["changes"]).lower()
+    tokens = {token for token in SEARCH_TOKEN.findall(text) if len(token) >= MIN_TOKEN_LENGTH}
+    tokens.add(record["version"])
+    return sorted(tokens)
+
+
+def search_index_file(year: str) -> str:
+    """Dateiname des Suchindex-Abschnitts eines Jahres"""
+    return f'search-{year}.json'
+
+
+def add_to_search_index(search_index: Dict, record_id: int, record: Dict):
+    """Trägt eine Version in den Suchindex ein; die ID-Listen bleiben aufsteigend sortiert"""
+    tokens = search_index.setdefault("tokens", {})
+    for token in search_tokens(record):
+        ids = tokens.setdefault(token, [])
+        if not ids or ids[-1] < record_id:
+            ids.append(record_id)
+    search_index["count"] = max(search_index.get("count", 0), record_id + 1)
+
 
 class ReleaseManager:
-    def __init__(self):
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not self.openai_api_key:
-            raise ValueError("OPENAI_API_KEY nicht gefunden")
-        
-        openai.api_key = self.openai_api_key
-        self.client = openai.OpenAI()
+    def __init__(self, client=None):
+        # Der OpenAI-Client wird erst erzeugt, wenn Commits nicht lokal klassifiziert werden können
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            api_key = os.getenv('OPENAI_API_KEY')
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY nicht gefunden")
+            import openai
+            openai.api_key = api_key
+            # OPENAI_BASE_URL erlaubt einen lokalen Testserver; Wiederholungen übernimmt summarize_commits
+            self._client = openai.OpenAI(base_url=os.getenv('OPENAI_BASE_URL') or None, max_retries=0)
+        return self._client
 
     def get_current_version(self) -> str:
         """Liest die aktuelle Version aus version.txt"""
@@ -24,25 +226,117 @@ class ReleaseManager:
             return "0.0.0"  # Startversion wenn keine Datei existiert
 
     def analyze_commits(self, commits: List[str]) -> Tuple[str, List[str]]:
-        """Analysiert Commits mit OpenAI um die Versionsnummer und verbesserte Beschreibungen zu generieren"""
+        """Bestimmt die neue Versionsnummer und die Änderungsliste.
+
+        Commits mit Conventional-Commit-Präfix (feat:, fix:, ..., BREAKING
+        CHANGE) werden lokal und reproduzierbar klassifiziert; Commits ohne
+        Präfix, auch "Add ..." oder "Fix ...", gehen an OpenAI.
+        """
         
         current_version = self.get_current_version()
-        
+
+        classified, unclassified = [], []
+        for line in commits:
+            sha, subject = split_commit(line)
+            if is_release_noise(subject):
+                continue
+            commit = parse_commit(subject)
+            if commit is None:
+                unclassified.append((sha, subject))
+            else:
+                classified.append(commit)
+
+        bumps = [commit["bump"] for commit in classified]
+        changes = group_changes(classified)
+        if unclassified:
+            bump, llm_changes = self.summarize_commits(current_version, unclassified)
+            bumps.append(bump)
+            changes.extend(llm_changes)
+
+        level = max(bumps, key=BUMP_LEVELS.__getitem__, default='patch')
+        return bump_version(current_version, level), changes
+
+    def summarize_commits(self, current_version: str, commits: List[Tuple[str, str]]) -> Tuple[str, List[str]]:
+        """Fasst (SHA, Betreff)-Paare abschnittsweise und parallel mit OpenAI zusammen.
+
+        Jeder Abschnitt bleibt unter CHUNK_TOKEN_BUDGET; höchstens
+        MAX_CONCURRENT_REQUESTS Anfragen laufen gleichzeitig. Die höchste
+        Versionserhöhung aller Abschnitte gewinnt, die Änderungen erscheinen
+        wie im git log mit den neuesten zuerst.
+        """
+        chunks = chunk_commits(commits)
+        pending = [chunk for chunk in chunks if self._load_cached_chunk(chunk) is None]
+        if pending:
+            self.client  # Client vor dem Start der Threads anlegen, fehlender API-Key fällt sofort auf
+
+        workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda chunk: self._summarize_chunk(current_version, chunk), chunks))
+
+        bump = max((result[0] for result in results), key=BUMP_LEVELS.__getitem__)
+        changes = [change for _, chunk_changes in reversed(results) for change in chunk_changes]
+        return bump, changes
+
+    def _summarize_chunk(self, current_version: str, chunk: List[Tuple[str, str]]) -> Tuple[str, List[str]]:
+        cached = self._load_cached_chunk(chunk)
+        if cached is not None:
+            return cached
+
+        subjects = [subject for _, subject in reversed(chunk)]
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                bump, changes = self.analyze_with_openai(current_version, subjects)
+                break
+            except Exception as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = RETRY_BASE_DELAY * 2 ** attempt * random.uniform(0.5, 1.0)
+                print(f"⚠️ OpenAI-Anfrage fehlgeschlagen ({str(e)}), neuer Versuch in {delay:.1f}s")
+                time.sleep(delay)
+
+        self._save_cached_chunk(chunk, bump, changes)
+        return bump, changes
+
+    def _chunk_cache_path(self, chunk: List[Tuple[str, str]]) -> str:
+        digest = hashlib.sha256(OPENAI_MODEL.encode('utf-8'))
+        for sha, _ in chunk:
+            digest.update(b"\n" + sha.encode('utf-8'))
+        return os.path.join(CACHE_DIR, f"{digest.hexdigest()}.json")
+
+    def _load_cached_chunk(self, chunk: List[Tuple[str, str]]) -> Optional[Tuple[str, List[str]]]:
+        try:
+            with open(self._chunk_cache_path(chunk), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached["bump"], cached["changes"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def _save_cached_chunk(self, chunk: List[Tuple[str, str]], bump: str, changes: List[str]):
+        path = self._chunk_cache_path(chunk)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"commits": [sha for sha, _ in chunk], "bump": bump, "changes": changes}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def analyze_with_openai(self, current_version: str, commits: List[str]) -> Tuple[str, List[str]]:
+        """Lässt OpenAI die Stufe der Versionserhöhung und Beschreibungen für nicht klassifizierte Commits bestimmen"""
+
         prompt = f"""
         Die aktuelle Version ist: {current_version}
 
-        Analysiere diese Git-Commits und erstelle eine neue Version und verbesserte Beschreibungen.
+        Analysiere diese Git-Commits und bestimme die nötige Versionserhöhung und verbesserte Beschreibungen.
         Folge dabei Semantic Versioning (MAJOR.MINOR.PATCH):
-        - MAJOR: Breaking Changes
-        - MINOR: Neue Features
-        - PATCH: Bugfixes
+        - major: Breaking Changes
+        - minor: Neue Features
+        - patch: Bugfixes
 
         Aktuelle Commits:
         {commits}
 
         Antworte ausschließlich mit einem JSON-Objekt im folgenden Format:
         {{
-            "version": "x.y.z",
+            "bump": "major" | "minor" | "patch",
             "changes": [
                 "Klare Beschreibung der Änderung 1",
                 "Klare Beschreibung der Änderung 2"
@@ -51,7 +345,7 @@ class ReleaseManager:
         """
 
         response = self.client.chat.completions.create(
-            model="gpt-4-turbo-preview",
+            model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": "Du bist ein erfahrener Software Release Manager, der Semantic Versioning perfekt beherrscht und technische Änderungen klar kommunizieren kann. Antworte ausschließlich im spezifizierten JSON-Format."},
                 {"role": "user", "content": prompt}
@@ -62,13 +356,18 @@ class ReleaseManager:
 
         try:
             result = json.loads(response.choices[0].message.content)
-            return result["version"], result["changes"]
-        except (json.JSONDecodeError, KeyError) as e:
+            bump, changes = result["bump"].lower(), result["changes"]
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             raise ValueError(f"Fehler beim Parsen der OpenAI-Antwort: {str(e)}")
+        if bump not in BUMP_LEVELS:
+            raise ValueError(f"Ungültige Versionserhöhung in der OpenAI-Antwort: {bump}")
+        return bump, changes
 
     def create_release_notes(self, version: str, changes: List[str], build_id: str, commit_sha: str) -> Tuple[str, Dict]:
-        """Erstellt Release Notes in Text- und JSON-Format"""
+        """Erstellt den Eintrag der neuen Version in Text- und JSON-Format"""
         
+        changes = normalize_changes(changes)
+
         # Text Format
         today = datetime.now().strftime('%d.%m.%Y')
         text_content = f"""# Version {version}
@@ -85,53 +384,182 @@ Datum: {today}
 
 """
 
-        # JSON Format
+        # JSON Format: ein Datensatz pro Version
         json_content = {
-            "versions": [{
-                "version": version,
-                "date": today,
-                "changes": changes,
-                "build": build_id,
-                "commit": commit_sha
-            }]
+            "version": version,
+            "date": today,
+            "changes": changes,
+            "build": build_id,
+            "commit": commit_sha
         }
 
-        # Wenn bereits Release Notes existieren, füge sie hinzu
-        if os.path.exists('release-notes.txt'):
-            with open('release-notes.txt', 'r', encoding='utf-8') as f:
-                existing_text = f.read()
-                text_content += existing_text
-
-        if os.path.exists('release-notes.json'):
-            with open('release-notes.json', 'r', encoding='utf-8') as f:
-                try:
-                    existing_json = json.load(f)
-                    json_content["versions"].extend(existing_json["versions"])
-                except json.JSONDecodeError:
-                    pass
-
         return text_content, json_content
 
     def save_release_files(self, version: str, text_content: str, json_content: Dict):
-        """Speichert die Release-Dateien"""
-        
-        # Speichere Version
+        """Speichert die Release-Dateien.
+
+        Bestehende Einträge werden nicht neu geschrieben: der Datensatz wird an
+        release-notes/records.jsonl und der Text an release-notes.txt angehängt.
+        Neu geschrieben werden nur kleine, begrenzte Dateien: der Index, die
+        letzten LATEST_COUNT Versionen sowie Versions- und Suchindex-Abschnitt
+        des laufenden Jahres.
+        """
+        self.migrate_legacy_notes()
+
+        index = self.load_store_index()
+        if index["count"] and index["latest"] == json_content["version"]:
+            raise ValueError(f"Version {json_content['version']} ist bereits in den Release Notes enthalten")
+
+        # Hänge Datensatz und Text an
+        os.makedirs(STORE_DIR, exist_ok=True)
+        line = json.dumps(json_content, ensure_ascii=False) + "\n"
+        with open(RECORDS_FILE, 'a', encoding='utf-8') as f:
+            f.write(line)
+        with open('release-notes.txt', 'a', encoding='utf-8') as f:
+            f.write(text_content)
+
+        # Aktualisiere die öffentlichen Abschnitte, neueste Version zuerst;
+        # die ID ist die Position im Speicher und wird vom Suchindex referenziert
+        record_id = index["count"]
+        public_record = dict(json_content, id=record_id)
+        latest = self._read_versions(os.path.join(PUBLIC_DIR, 'latest.json'))
+        self._write_versions(os.path.join(PUBLIC_DIR, 'latest.json'), [public_record] + latest[:LATEST_COUNT - 1])
+
+        year = release_year(json_content)
+        year_file = os.path.join(PUBLIC_DIR, f'{year}.json')
+        self._write_versions(year_file, [public_record] + self._read_versions(year_file))
+
+        search_index = self._read_public_json(search_index_file(year)) or {"count": 0, "tokens": {}}
+        add_to_search_index(search_index, record_id, json_content)
+        self._write_public_json(search_index_file(year), search_index)
+
+        index["latest"] = json_content["version"]
+        index["count"] += 1
+        index["years"][year] = index["years"].get(year, 0) + 1
+        index["records_bytes"] += len(line.encode('utf-8'))
+        self._write_indexes(index)
+
+        # Version erst speichern, wenn die Release Notes geschrieben sind
         with open('version.txt', 'w', encoding='utf-8') as f:
             f.write(version)
 
-        # Speichere Text Release Notes
-        with open('release-notes.txt', 'w', encoding='utf-8') as f:
-            f.write(text_content)
+    def load_store_index(self) -> Dict:
+        """Liest den Index des Release-Notes-Speichers (leer, wenn noch keiner existiert)"""
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"latest": None, "count": 0, "years": {}, "records_bytes": 0}
+
+    def migrate_legacy_notes(self):
+        """Überführt die alte release-notes.json einmalig in den Append-only-Speicher.
+
+        Die alten Dateien führen die neueste Version zuerst; Speicher und
+        release-notes.txt werden danach chronologisch fortgeschrieben.
+        """
+        if os.path.exists(RECORDS_FILE) or not os.path.exists('release-notes.json'):
+            return
+
+        with open('release-notes.json', 'r', encoding='utf-8') as f:
+            try:
+                versions = json.load(f)["versions"]
+            except (json.JSONDecodeError, KeyError):
+                versions = []
+
+        os.makedirs(STORE_DIR, exist_ok=True)
+        with open(RECORDS_FILE, 'w', encoding='utf-8') as f:
+            for record in reversed(versions):
+                record["changes"] = normalize_changes(record.get("changes", []))
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if os.path.exists('release-notes.txt'):
+            with open('release-notes.txt', 'r', encoding='utf-8') as f:
+                entries = [entry for entry in f.read().split('\n---\n\n') if entry.strip()]
+            with open('release-notes.txt', 'w', encoding='utf-8') as f:
+                for entry in reversed(entries):
+                    f.write(normalize_text(entry.rstrip('\n')) + '\n\n---\n\n')
+
+        self.rebuild_public_notes()
+
+    def rebuild_public_notes(self):
+        """Erzeugt Index, Suchindex und alle öffentlichen Abschnitte vollständig aus records.jsonl"""
+        records = []
+        search_indexes: Dict[str, Dict] = {}
+        with open(RECORDS_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    record["changes"] = normalize_changes(record["changes"])
+                    record_id = len(records)
+                    search_index = search_indexes.setdefault(release_year(record), {"count": 0, "tokens": {}})
+                    add_to_search_index(search_index, record_id, record)
+                    records.append(dict(record, id=record_id))
+        records.reverse()
+
+        by_year: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_year.setdefault(release_year(record), []).append(record)
+
+        self._write_versions(os.path.join(PUBLIC_DIR, 'latest.json'), records[:LATEST_COUNT])
+        for year, versions in by_year.items():
+            self._write_versions(os.path.join(PUBLIC_DIR, f'{year}.json'), versions)
+            self._write_public_json(search_index_file(year), search_indexes[year])
+
+        self._write_indexes({
+            "latest": records[0]["version"] if records else None,
+            "count": len(records),
+            "years": {year: len(versions) for year, versions in by_year.items()},
+            "records_bytes": os.path.getsize(RECORDS_FILE),
+        })
+
+    def _read_versions(self, path: str) -> List[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)["versions"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return []
+
+    def _write_versions(self, path: str, versions: List[Dict]):
+        self._write_public_json(os.path.basename(path), {"versions": versions})
+
+    def _read_public_json(self, name: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(PUBLIC_DIR, name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_public_json(self, name: str, data: Dict):
+        """Schreibt eine Datei für die Release-Notes-Seite, kompakt und ohne Escapes für Umlaute"""
+        os.makedirs(PUBLIC_DIR, exist_ok=True)
+        with open(os.path.join(PUBLIC_DIR, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def _write_indexes(self, index: Dict):
+        """Schreibt den internen Index und den öffentlichen Index für die Release-Notes-Seite"""
+        os.makedirs(STORE_DIR, exist_ok=True)
+        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
 
-        # Speichere JSON Release Notes
-        with open('release-notes.json', 'w', encoding='utf-8') as f:
-            json.dump(json_content, f, indent=2, ensure_ascii=False)
+        # IDs sind chronologisch vergeben, jedes Jahr belegt daher einen zusammenhängenden Bereich
+        years, first_id = [], 0
+        for year, count in sorted(index["years"].items()):
+            years.append({
+                "year": year,
+                "count": count,
+                "file": f"{year}.json",
+                "searchFile": search_index_file(year),
+                "firstId": first_id,
+            })
+            first_id += count
 
-        # Kopiere JSON-Datei auch in das public-Verzeichnis, damit die
-        # Release Notes von der Anwendung geladen werden können
-        os.makedirs('public', exist_ok=True)
-        with open('public/release-notes.json', 'w', encoding='utf-8') as f:
-            json.dump(json_content, f, indent=2, ensure_ascii=False)
+        self._write_public_json('index.json', {
+            "latest": index["latest"],
+            "total": index["count"],
+            "latestFile": "latest.json",
+            "latestCount": min(LATEST_COUNT, index["count"]),
+            "years": list(reversed(years)),
+        })
 
 def main():
     if len(sys.argv) < 4:
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Offline-Tests für Commit-Klassifizierung und Release-Dateien in release_manager.py.
+
+Ausführen mit:
+    python -m unittest discover -s .github
+"""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import release_manager
+from release_manager import ReleaseManager
+
+
+class StubClient:
+    """Ersetzt openai.OpenAI und merkt sich die Commits jeder Anfrage."""
+
+    def __init__(self, bump="minor", changes=None):
+        self.bump = bump
+        self.changes = changes if changes is not None else ["Beschreibung von OpenAI"]
+        self.requests = []
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs["messages"][-1]["content"])
+        content = json.dumps({"bump": self.bump, "changes": self.changes})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Beantwortet /v1/chat/completions wie die OpenAI-API; Zustand liegt am Server"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server = self.server
+        with server.lock:
+            server.requests.append(body["messages"][-1]["content"])
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        if fail:
+            self.respond(500, {"error": {"message": "Vorübergehender Fehler", "type": "server_error"}})
+            return
+        content = json.dumps({"bump": "patch", "changes": ["Zusammenfassung von OpenAI"]})
+        self.respond(200, {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    def respond(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def commit_line(number):
+    """Commit ohne Präfix mit langem Betreff, damit mehrere Abschnitte entstehen"""
+    sha = hashlib.sha1(str(number).encode('ascii')).hexdigest()
+    return f"{sha} Update module {number}: " + "details " * 50 + "(dajor)\n"
+
+
+class AnalyzeCommitsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        with open('version.txt', 'w', encoding='utf-8') as f:
+            f.write("0.54.0")
+
+        patches = [
+            mock.patch.dict(os.environ, {}, clear=False),
+            mock.patch.object(release_manager, 'CACHE_DIR', os.path.join(self.tmp.name, '.release-cache')),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop('OPENAI_API_KEY', None)
+
+    def test_conventional_commits_are_classified_locally(self):
+        stub = StubClient()
+        version, changes = ReleaseManager(client=stub).analyze_commits([
+            "fix(pdf): Betrag rechtsbündig (dajor)\n",
+            "feat: Eigenbeleg (dajor)\n",
+            "docs: README ergänzt\n",
+            "Bump version to 0.54.0 #auto-release (dajor)\n",
+        ])
+        self.assertEqual(version, "0.55.0")
+        self.assertEqual(changes, [
+            "Neu: Eigenbeleg",
+            "Fehlerbehebung: Betrag rechtsbündig",
+            "Dokumentation: README ergänzt",
+        ])
+        self.assertEqual(stub.requests, [])
+
+    def test_breaking_change_bumps_major(self):
+        version, changes = ReleaseManager(client=StubClient()).analyze_commits([
+            "refactor!: neues Datenformat\n",
+            "fix: Tippfehler\n",
+        ])
+        self.assertEqual(version, "1.0.0")
+        self.assertEqual(changes[0], "Breaking Change: Neues Datenformat")
+
+    def test_no_api_key_needed_without_llm_call(self):
+        version, _ = ReleaseManager().analyze_commits(["chore: Abhängigkeiten aktualisiert\n"])
+        self.assertEqual(version, "0.54.1")
+
+    def test_unknown_prefixes_go_to_openai(self):
+        commits = [
+            "Feature: big new thing (dajor)\n",
+            "WIP: stuff\n",
+            "Note: this is a plain sentence\n",
+        ]
+        for commit in commits:
+            self.assertIsNone(release_manager.parse_commit(commit), commit)
+
+        stub = StubClient(bump="minor", changes=["Großes neues Feature"])
+        version, changes = ReleaseManager(client=stub).analyze_commits(commits + ["fix: Tippfehler\n"])
+        self.assertEqual(version, "0.55.0")
+        self.assertEqual(changes, ["Fehlerbehebung: Tippfehler", "Großes neues Feature"])
+        self.assertEqual(len(stub.requests), 1)
+        for commit in commits:
+            self.assertIn(commit.split(' (')[0].strip(), stub.requests[0])
+        self.assertNotIn("Tippfehler", stub.requests[0])
+
+    def test_plain_subjects_go_to_openai(self):
+        commits = [
+            "Add missing null check (dajor)\n",
+            "Add tests for the parser\n",
+            "Fix typo in README\n",
+        ]
+        for commit in commits:
+            self.assertIsNone(release_manager.parse_commit(commit), commit)
+
+        stub = StubClient(bump="patch", changes=["Null-Prüfung ergänzt"])
+        version, _ = ReleaseManager(client=stub).analyze_commits(commits)
+        self.assertEqual(version, "0.54.1")
+        self.assertEqual(len(stub.requests), 1)
+        for commit in commits:
+            self.assertIn(commit.split(' (')[0].strip(), stub.requests[0])
+
+    def test_breaking_marker_without_prefix_is_classified_locally(self):
+        stub = StubClient()
+        version, changes = ReleaseManager(client=stub).analyze_commits(["Drop v1 API BREAKING CHANGE\n"])
+        self.assertEqual(version, "1.0.0")
+        self.assertEqual(changes, ["Breaking Change: Drop v1 API"])
+        self.assertEqual(stub.requests, [])
+
+    def test_openai_bump_can_raise_the_version(self):
+        stub = StubClient(bump="major", changes=["Neue API"])
+        version, _ = ReleaseManager(client=stub).analyze_commits(["Rework API: removed v1\n", "feat: x\n"])
+        self.assertEqual(version, "1.0.0")
+
+
+class FakeOpenAIServerTest(unittest.TestCase):
+    """Abschnitte, Cache, Wiederholungen und OPENAI_BASE_URL gegen einen lokalen Server"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenAIHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.failures = 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        with open('version.txt', 'w', encoding='utf-8') as f:
+            f.write("0.54.0")
+
+        patches = [
+            mock.patch.dict(os.environ, {
+                'OPENAI_API_KEY': 'test',
+                'OPENAI_BASE_URL': f"http://127.0.0.1:{self.server.server_port}/v1",
+            }),
+            mock.patch.object(release_manager, 'RETRY_BASE_DELAY', 0),
+            mock.patch.object(release_manager, 'CACHE_DIR', os.path.join(self.tmp.name, '.release-cache')),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        # git log listet die neuesten Commits zuerst
+        self.commits = [commit_line(number) for number in reversed(range(40))]
+        self.chunks = release_manager.chunk_commits([release_manager.split_commit(c) for c in self.commits])
+
+    def run_release(self, commits):
+        self.server.requests.clear()
+        return ReleaseManager().analyze_commits(commits)
+
+    def test_chunks_stay_within_budget(self):
+        self.assertGreaterEqual(len(self.chunks), 3)
+        self.assertEqual(sum(len(chunk) for chunk in self.chunks), len(self.commits))
+        for chunk in self.chunks:
+            used = sum(release_manager.estimate_tokens(subject) for _, subject in chunk)
+            self.assertLessEqual(used, release_manager.CHUNK_TOKEN_BUDGET)
+
+    def test_cache_is_reused_across_runs(self):
+        version, changes = self.run_release(self.commits)
+        self.assertEqual(version, "0.54.1")
+        self.assertEqual(changes, ["Zusammenfassung von OpenAI"] * len(self.chunks))
+        self.assertEqual(len(self.server.requests), len(self.chunks))
+        self.assertIn("Update module 0:", "".join(self.server.requests))
+
+        self.assertEqual(self.run_release(self.commits), (version, changes))
+        self.assertEqual(self.server.requests, [])
+
+        # Ein neuer Commit ändert nur den jüngsten Abschnitt
+        self.run_release([commit_line(40)] + self.commits)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn("Update module 40:", self.server.requests[0])
+
+    def test_transient_server_error_is_retried(self):
+        self.server.failures = 1
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            version, changes = self.run_release(self.commits)
+        self.assertIn("Error code: 500", output.getvalue())
+        self.assertEqual(version, "0.54.1")
+        self.assertEqual(len(changes), len(self.chunks))
+        self.assertEqual(len(self.server.requests), len(self.chunks) + 1)
+
+
+class SaveReleaseFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.manager = ReleaseManager()
+
+    def release(self, version, date):
+        record = {"version": version, "date": date, "changes": [f"Neu: Änderung {version}"], "build": "1", "commit": "abc"}
+        self.manager.save_release_files(version, f"# Version {version}\n", record)
+
+    def public_files(self):
+        files = {}
+        for name in sorted(os.listdir(release_manager.PUBLIC_DIR)):
+            with open(os.path.join(release_manager.PUBLIC_DIR, name), 'r', encoding='utf-8') as f:
+                files[name] = json.load(f)
+        return files
+
+    def test_incremental_output_matches_rebuild(self):
+        self.release("0.1.0", "30.12.2024")
+        self.release("0.2.0", "02.01.2025")
+        self.release("0.3.0", "03.01.2025")
+        incremental = self.public_files()
+
+        self.assertEqual(
+            sorted(incremental),
+            ["2024.json", "2025.json", "index.json", "latest.json", "search-2024.json", "search-2025.json"],
+        )
+        self.assertEqual(incremental["search-2025.json"]["tokens"]["0.3.0"], [2])
+        self.assertNotIn("0.1.0", incremental["search-2025.json"]["tokens"])
+
+        self.manager.rebuild_public_notes()
+        self.assertEqual(self.public_files(), incremental)
+
+    def test_duplicate_version_leaves_version_file_unchanged(self):
+        self.release("0.1.0", "30.12.2024")
+        with open('version.txt', 'w', encoding='utf-8') as f:
+            f.write("0.0.9")
+
+        with self.assertRaisesRegex(ValueError, "bereits"):
+            self.release("0.1.0", "31.12.2024")
+        with open('version.txt', 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "0.0.9")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,6 @@ const nextConfig = {
         source: '/release-notes.txt',
         destination: '/release-notes.txt',
       },
-      {
-        source: '/release-notes.json',
-        destination: '/release-notes.json',
-      },
     ];
   },
 };
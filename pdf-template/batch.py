@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Batch-Renderer für ausgefüllte Bewirtungsbelege.
+
+Liest Belege zeilenweise als JSONL (Datei oder stdin) und rendert sie über
+einen Pool von Worker-Prozessen. Es sind immer nur wenige Pakete gleichzeitig
+unterwegs, der Speicherbedarf bleibt daher unabhängig von der Eingabegröße.
+
+Verwendung:
+    python batch.py belege.jsonl --out ausgabe/ --workers 4
+    cat belege.jsonl | python batch.py - --out ausgabe/ --shard-size 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import template
+
+
+def read_records(stream):
+    """Liefert (Zeilennummer, Datensatz, Fehler) für jede nicht-leere Zeile."""
+    for lineno, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield lineno, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield lineno, None, f"Ungültiges JSON: {e}"
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def init_worker():
+    """Lädt das Logo einmal pro Worker-Prozess vor."""
+    try:
+        template.load_logo()
+    except Exception as e:
+        print("Fehler beim Laden des Logos:", e, file=sys.stderr)
+
+
+def render_records(out_dir, items):
+    """Rendert jeden Beleg in eine eigene PDF-Datei."""
+    rendered, failures = 0, []
+    for lineno, record in items:
+        path = os.path.join(out_dir, f"beleg-{lineno:07d}.pdf")
+        try:
+            c = template.new_canvas(path)
+            template.draw_record(c, record)
+            c.save()
+            rendered += 1
+        except Exception as e:
+            failures.append((lineno, str(e)))
+            if os.path.exists(path):
+                os.remove(path)
+    return rendered, failures
+
+
+def render_shard(out_dir, shard_index, items):
+    """Rendert ein Paket von Belegen als mehrseitige PDF-Datei."""
+    path = os.path.join(out_dir, f"belege-{shard_index:05d}.pdf")
+    c = template.new_canvas(path)
+    rendered, failures = 0, []
+    for lineno, record in items:
+        try:
+            template.draw_record(c, record)
+            rendered += 1
+        except Exception as e:
+            failures.append((lineno, str(e)))
+    if rendered:
+        c.save()
+    return rendered, failures
+
+
+def run(stream, out_dir, workers, shard_size=0, chunk_size=32, failed_log=None):
+    """Rendert alle Belege aus stream und liefert (gerendert, Fehlerliste, Sekunden)."""
+    os.makedirs(out_dir, exist_ok=True)
+    size = shard_size or chunk_size
+    max_pending = workers * 2
+    rendered, failures = 0, []
+    started = time.perf_counter()
+
+    def tally(count, failed):
+        nonlocal rendered
+        rendered += count
+        failures.extend(failed)
+        if failed_log:
+            for lineno, error in failed:
+                failed_log.write(json.dumps({"line": lineno, "error": error}, ensure_ascii=False) + "\n")
+
+    def collect(done):
+        for future in done:
+            tally(*future.result())
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        pending = set()
+        for shard_index, chunk in enumerate(chunked(read_records(stream), size)):
+            items = []
+            for lineno, data, error in chunk:
+                if error:
+                    tally(0, [(lineno, error)])
+                else:
+                    items.append((lineno, data))
+            if not items:
+                continue
+            if shard_size:
+                pending.add(pool.submit(render_shard, out_dir, shard_index, items))
+            else:
+                pending.add(pool.submit(render_records, out_dir, items))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+
+    return rendered, failures, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendert Bewirtungsbelege aus einer JSONL-Datei.")
+    parser.add_argument("input", help="JSONL-Datei mit einem Beleg pro Zeile oder '-' für stdin")
+    parser.add_argument("--out", required=True, help="Ausgabeverzeichnis")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Anzahl Worker-Prozesse")
+    parser.add_argument("--shard-size", type=int, default=0,
+                        help="Belege pro PDF-Datei (0 = eine Datei pro Beleg)")
+    parser.add_argument("--chunk-size", type=int, default=32,
+                        help="Belege pro Auftrag an einen Worker, wenn nicht gesharded wird")
+    parser.add_argument("--failed", help="Schreibt fehlgeschlagene Datensätze als JSONL in diese Datei")
+    args = parser.parse_args()
+
+    stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    failed_log = open(args.failed, "w", encoding="utf-8") if args.failed else None
+    try:
+        rendered, failures, elapsed = run(
+            stream, args.out, args.workers, args.shard_size, args.chunk_size, failed_log
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if failed_log:
+            failed_log.close()
+
+    rate = rendered / elapsed if elapsed else 0.0
+    print(f"✅ {rendered} Belege in {elapsed:.2f}s gerendert ({rate:.1f} Belege/s)", file=sys.stderr)
+    if failures:
+        print(f"❌ {len(failures)} Datensätze fehlgeschlagen", file=sys.stderr)
+        for lineno, error in failures[:10]:
+            print(f"   Zeile {lineno}: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Benchmarks für das Rendern der Bewirtungsformulare.
+
+Jedes Szenario läuft in einem eigenen Prozess, damit Spitzen-RSS und
+Kaltstart nicht von vorherigen Szenarien verfälscht werden. Gemessen
+werden Seiten/s, p50/p99-Latenz, Spitzen-RSS und Bytes pro Seite.
+
+Verwendung:
+    python bench.py --out bench-results.json
+    python bench.py --baseline bench-baseline.json --threshold 0.15
+    python bench.py --quick --scenario warm_single --scenario multipage_100
+
+Mit --baseline endet das Skript mit Exit-Code 1, sobald eine Kennzahl
+um mehr als den Schwellwert schlechter ist als in der Baseline. Läufe mit
+und ohne --quick sind nicht vergleichbar und werden mit Exit-Code 2
+abgelehnt.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE_RECORD = {
+    "firma": "DocBits GmbH / Max Mustermann",
+    "datum": "17.10.2025",
+    "ort": "Osteria del Parco, Berlin",
+    "anlass": "Projektbesprechung zur Einführung der digitalen Belegverarbeitung",
+    "teilnehmer": ["Max Mustermann (DocBits GmbH)", "Erika Musterfrau (Kunde AG)"],
+    "gesamtbetrag": "123,45",
+    "gesamtbetragNetto": "103,74",
+    "gesamtbetragMwst": "19,71",
+    "trinkgeld": "5,00",
+    "trinkgeldMwst": "0,95",
+    "zahlungsart": "firma",
+    "bewirtungsart": "kunden",
+}
+
+# Kennzahl -> True, wenn größer besser ist
+METRICS = {
+    "pages_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_kb": False,
+    "bytes_per_page": False,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, pages, elapsed, total_bytes):
+    return {
+        "pages": pages,
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "bytes_per_page": round(total_bytes / pages, 1) if pages else 0.0,
+    }
+
+
+def peak_rss_kb(children=False):
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    rss = resource.getrusage(who).ru_maxrss
+    # macOS meldet Bytes, Linux Kilobytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+# ===== Szenarien (laufen im Kindprozess) =====
+
+def scenario_cold_start(runs):
+    code = "import template; template.render_pdf()"
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=TEMPLATE_DIR, check=True)
+        latencies.append(time.perf_counter() - t0)
+    result = summarize(latencies, runs, time.perf_counter() - started, 0)
+    result.pop("bytes_per_page")
+    result["peak_rss_kb"] = peak_rss_kb(children=True)
+    return result
+
+
+def scenario_warm_single(runs):
+    import template
+
+    template.warm_up()
+    latencies, total_bytes = [], 0
+    started = time.perf_counter()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        total_bytes += len(template.render_pdf(SAMPLE_RECORD))
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, runs, time.perf_counter() - started, total_bytes)
+
+
+def scenario_create_pdf(runs):
+    import template
+
+    template.warm_up()
+    latencies, total_bytes = [], 0
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            started = time.perf_counter()
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                template.create_pdf()
+                latencies.append(time.perf_counter() - t0)
+            elapsed = time.perf_counter() - started
+            total_bytes = runs * sum(
+                os.path.getsize(name) for name in ("kundenbewirtung.pdf", "mitarbeiterbewirtung.pdf")
+            )
+        finally:
+            os.chdir(cwd)
+    # create_pdf() erzeugt zwei einseitige Dokumente
+    return summarize(latencies, runs * 2, elapsed, total_bytes)
+
+
+def scenario_batch(size, workers):
+    import batch
+
+    lines = [json.dumps(SAMPLE_RECORD) + "\n"] * size
+    with tempfile.TemporaryDirectory() as tmp:
+        rendered, failures, elapsed = batch.run(iter(lines), tmp, workers)
+        total_bytes = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+    if failures:
+        raise RuntimeError(f"{len(failures)} Belege fehlgeschlagen")
+    result = summarize([], rendered, elapsed, total_bytes)
+    # Die Worker liefern keine Zeiten je Beleg; p50/p99 wären nur der Durchschnitt
+    del result["p50_ms"], result["p99_ms"]
+    result["peak_rss_kb_workers"] = peak_rss_kb(children=True)
+    return result
+
+
+def scenario_multipage(pages):
+    import io
+
+    import template
+
+    template.warm_up()
+    latencies = []
+    buffer = io.BytesIO()
+    c = template.new_canvas(buffer)
+    started = time.perf_counter()
+    for _ in range(pages):
+        t0 = time.perf_counter()
+        template.draw_record(c, SAMPLE_RECORD)
+        latencies.append(time.perf_counter() - t0)
+    c.save()
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, pages, elapsed, len(buffer.getvalue()))
+
+
+def scenario_plan(quick):
+    """Liefert (Name, Funktion, Argumente) aller Szenarien."""
+    scale = 0.1 if quick else 1
+    workers = min(4, os.cpu_count() or 1)
+    plan = [
+        ("cold_start", "scenario_cold_start", [max(2, int(10 * scale))]),
+        ("warm_single", "scenario_warm_single", [max(20, int(500 * scale))]),
+        ("create_pdf", "scenario_create_pdf", [max(10, int(200 * scale))]),
+    ]
+    for size in (10, 100, 1000):
+        plan.append((f"batch_{size}", "scenario_batch", [max(1, int(size * scale)), workers]))
+    for pages in (10, 100, 1000):
+        plan.append((f"multipage_{pages}", "scenario_multipage", [max(1, int(pages * scale))]))
+    return plan
+
+
+def run_scenario(func, args):
+    """Startet ein Szenario in einem frischen Interpreter und liefert dessen Ergebnis."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", func, json.dumps(args)],
+        cwd=TEMPLATE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Szenario {func} fehlgeschlagen:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """Liefert eine Liste von Regressionen gegenüber der Baseline."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in current or not previous.get(metric):
+                continue
+            old, new = previous[metric], current[metric]
+            change = (new - old) / old
+            if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+                regressions.append((name, metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für pdf-template.")
+    parser.add_argument("--out", help="Ergebnisse als JSON in diese Datei schreiben")
+    parser.add_argument("--baseline", help="Gespeicherte Ergebnisse, gegen die verglichen wird")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Erlaubte relative Verschlechterung je Kennzahl (Standard: 0.15)")
+    parser.add_argument("--scenario", action="append", help="Nur dieses Szenario ausführen (mehrfach möglich)")
+    parser.add_argument("--quick", action="store_true", help="Reduzierte Wiederholungen für schnelle Läufe")
+    parser.add_argument("--child", nargs=2, metavar=("FUNKTION", "ARGS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        func, func_args = args.child
+        result = globals()[func](*json.loads(func_args))
+        result.setdefault("peak_rss_kb", peak_rss_kb())
+        print(json.dumps(result))
+        return
+
+    import reportlab
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "scenarios": {},
+    }
+    for name, func, func_args in scenario_plan(args.quick):
+        if args.scenario and name not in args.scenario:
+            continue
+        result = run_scenario(func, func_args)
+        results["scenarios"][name] = result
+        latency = "  ".join(
+            f"{label} {result[key]:>8.2f} ms" if key in result else f"{label} {'-':>8} ms"
+            for label, key in (("p50", "p50_ms"), ("p99", "p99_ms"))
+        )
+        print(
+            f"{name:<16} {result.get('pages_per_s', 0):>9.1f} Seiten/s  {latency}  "
+            f"RSS {result['peak_rss_kb'] / 1024:>6.1f} MB  "
+            f"{result.get('bytes_per_page', 0):>8.0f} B/Seite",
+            file=sys.stderr,
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if bool(baseline.get("quick")) != args.quick:
+            # --quick rendert andere Seitenzahlen, z.B. unterscheidet sich bytes_per_page stark
+            print(
+                f"❌ Baseline wurde {'mit' if baseline.get('quick') else 'ohne'} --quick erstellt, "
+                f"dieser Lauf {'mit' if args.quick else 'ohne'}; Ergebnisse sind nicht vergleichbar",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} Regressionen über {args.threshold:.0%}:", file=sys.stderr)
+            for name, metric, old, new, change in regressions:
+                print(f"   {name}.{metric}: {old} -> {new} ({change:+.1%})", file=sys.stderr)
+            sys.exit(1)
+        print("✅ Keine Regressionen gegenüber der Baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Inhaltsadressierter Cache für gerenderte Formular-PDFs.
+
+Der Schlüssel ist ein SHA-256 über den Quelltext von template.py, die
+Logo-Datei und den kanonisch serialisierten Auftrag. Ändert sich Template
+oder Logo, werden alte Einträge damit automatisch nicht mehr getroffen.
+
+Es gibt zwei Stufen: einen LRU-Cache im Speicher und ein Verzeichnis auf
+der Platte. Beide werden über eine Größenobergrenze in Bytes begrenzt.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import template
+
+
+@lru_cache(maxsize=None)
+def template_fingerprint():
+    """Hash über Template-Quelltext und Logo; ändert sich mit jeder Formularänderung."""
+    digest = hashlib.sha256()
+    for path in (os.path.abspath(template.__file__), template.LOGO_PATH):
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b"missing:" + path.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cache_key(record=None, bewirtungsart="kunden"):
+    """Liefert den Cache-Schlüssel für einen Renderauftrag."""
+    if record is not None:
+        bewirtungsart = None  # kommt bei ausgefüllten Belegen aus dem Datensatz
+    payload = json.dumps(
+        {"record": record, "bewirtungsart": bewirtungsart},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )
+    digest = hashlib.sha256(template_fingerprint().encode("ascii"))
+    digest.update(payload.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Zweistufiger Cache (Speicher + Platte) für PDF-Bytes."""
+
+    def __init__(self, cache_dir=None, max_memory_bytes=32 * 1024 * 1024,
+                 max_disk_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".pdf"):
+                    continue
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".pdf")
+
+    def get(self, key):
+        """Liefert (pdf_bytes, Stufe) oder (None, None) bei einem Fehlschlag."""
+        with self._lock:
+            pdf = self._memory.get(key)
+            if pdf is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return pdf, "memory"
+            if self.cache_dir and key in self._disk:
+                path = self._disk_path(key)
+                try:
+                    with open(path, "rb") as f:
+                        pdf = f.read()
+                    os.utime(path)
+                except FileNotFoundError:
+                    self._disk_bytes -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self.stats["disk_hits"] += 1
+                    self._put_memory(key, pdf)
+                    return pdf, "disk"
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, key, pdf):
+        with self._lock:
+            self._put_memory(key, pdf)
+            if self.cache_dir:
+                self._put_disk(key, pdf)
+
+    def _put_memory(self, key, pdf):
+        if len(pdf) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = pdf
+        self._memory_bytes += len(pdf)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["memory_evictions"] += 1
+
+    def _put_disk(self, key, pdf):
+        if key in self._disk or len(pdf) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, path)
+        self._disk[key] = len(pdf)
+        self._disk_bytes += len(pdf)
+        while self._disk_bytes > self.max_disk_bytes:
+            evicted_key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._disk_path(evicted_key))
+            except FileNotFoundError:
+                pass
+            self.stats["disk_evictions"] += 1
+
+    def snapshot(self):
+        """Zähler und aktuelle Belegung beider Stufen."""
+        with self._lock:
+            return dict(
+                self.stats,
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_bytes,
+                disk_entries=len(self._disk),
+                disk_bytes=self._disk_bytes,
+            )
+
+
+def render_cached(cache, record=None, bewirtungsart="kunden", stats=None):
+    """Rendert über den Cache; bei einem Treffer wird reportlab nicht aufgerufen.
+
+    Rückgabe ist (pdf_bytes, Stufe), die Stufe ist None bei einem Fehlschlag.
+    """
+    key = cache_key(record, bewirtungsart)
+    pdf, tier = cache.get(key)
+    if pdf is None:
+        pdf = template.render_pdf(record, bewirtungsart, stats)
+        cache.put(key, pdf)
+    return pdf, tier
@@ -0,0 +1,102 @@
+"""Zeit- und Operationsmessung je Formularabschnitt.
+
+Ein RenderStats-Objekt wird optional an die Zeichenfunktionen in
+template.py übergeben (Parameter stats). Ohne Objekt laufen diese
+unverändert, es entstehen keine Messkosten.
+
+    stats = RenderStats()
+    template.render_pdf(record, stats=stats)
+    stats.write_json("render-stats.json")
+    stats.write_prometheus("render-stats.prom")
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Obergrenzen der Histogramm-Buckets in Sekunden (Prometheus-Konvention)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class RenderStats:
+    """Sammelt Dauer und Anzahl Zeichenoperationen je Abschnitt als Histogramme."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def record(self, section, seconds, ops=0):
+        with self._lock:
+            entry = self._sections.get(section)
+            if entry is None:
+                entry = self._sections[section] = {
+                    "count": 0,
+                    "seconds": 0.0,
+                    "ops": 0,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                }
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["ops"] += ops
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+                    break
+            else:
+                entry["buckets"][-1] += 1
+
+    @contextmanager
+    def section(self, name, ops=0):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, ops)
+
+    def to_dict(self):
+        """Aggregierte Werte je Abschnitt; Buckets sind kumulativ wie bei Prometheus."""
+        with self._lock:
+            result = {}
+            for name, entry in self._sections.items():
+                cumulative, total = {}, 0
+                for bound, count in zip(self.buckets + (float("inf"),), entry["buckets"]):
+                    total += count
+                    cumulative["+Inf" if bound == float("inf") else repr(bound)] = total
+                result[name] = {
+                    "count": entry["count"],
+                    "seconds_total": round(entry["seconds"], 6),
+                    "seconds_avg": round(entry["seconds"] / entry["count"], 6),
+                    "ops_total": entry["ops"],
+                    "buckets": cumulative,
+                }
+            return result
+
+    def to_prometheus(self, prefix="bewirtung_render"):
+        """Exportiert die Histogramme im Prometheus-Textformat."""
+        lines = [
+            f"# HELP {prefix}_section_seconds Renderdauer je Formularabschnitt",
+            f"# TYPE {prefix}_section_seconds histogram",
+        ]
+        data = self.to_dict()
+        for name, entry in data.items():
+            for bound, count in entry["buckets"].items():
+                lines.append(f'{prefix}_section_seconds_bucket{{section="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_section_seconds_sum{{section="{name}"}} {entry["seconds_total"]}')
+            lines.append(f'{prefix}_section_seconds_count{{section="{name}"}} {entry["count"]}')
+        lines += [
+            f"# HELP {prefix}_section_ops_total Zeichenoperationen je Formularabschnitt",
+            f"# TYPE {prefix}_section_ops_total counter",
+        ]
+        for name, entry in data.items():
+            lines.append(f'{prefix}_section_ops_total{{section="{name}"}} {entry["ops_total"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    def write_prometheus(self, path, prefix="bewirtung_render"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
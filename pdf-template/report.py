@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Monatsbericht: alle Bewirtungsbelege eines Zeitraums in einer PDF-Datei.
+
+Die Seiten werden einzeln gerendert und sofort in die Ausgabedatei
+geschrieben. Schriften und das Formular-XObject (inkl. Logo) existieren
+nur einmal im Dokument und werden von allen Seiten referenziert. Im
+Speicher bleiben pro Seite nur Objekt-Offset und Seitenreferenz; die
+Lesezeichen werden in eine temporäre Datei ausgelagert.
+
+Vorne steht eine Übersichtsseite mit Summen (Gesamt, Netto, MwSt.,
+Trinkgeld), danach ein Belegverzeichnis mit Seitenzahlen, dazu ein
+Lesezeichen je Beleg. Übersicht und Verzeichnis werden wie alle Seiten
+erst am Ende geschrieben und im Seitenbaum nach vorne gestellt.
+
+Der Writer nutzt interne Attribute des reportlab-Canvas; die getestete
+Version ist in requirements.txt festgelegt.
+
+Verwendung:
+    python report.py belege.jsonl --out bericht-2025-10.pdf --title "Oktober 2025"
+    cat belege.jsonl | python report.py - --out bericht.pdf
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from decimal import Decimal
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import xObjectName
+from reportlab.pdfgen import canvas
+
+import template
+from batch import read_records
+
+AMOUNT_FIELDS = [
+    ("gesamtbetrag", "Gesamt"),
+    ("gesamtbetragNetto", "Netto"),
+    ("gesamtbetragMwst", "MwSt."),
+    ("trinkgeld", "Trinkgeld"),
+    ("trinkgeldMwst", "MwSt. Trinkgeld"),
+]
+
+# Feste Objektnummern; alle weiteren Objekte werden fortlaufend vergeben
+CATALOG, PAGES, RESOURCES, FONTS, FORM = 1, 2, 3, 4, 5
+
+# Zeilen je Seite im Belegverzeichnis
+INDEX_ROWS = 45
+
+
+def _pdf_text(text):
+    """PDF-Textstring als UTF-16BE-Hexstring (für Lesezeichen mit Umlauten)."""
+    return "<FEFF" + text.encode("utf-16-be").hex().upper() + ">"
+
+
+class StreamingPdfWriter:
+    """Schreibt ein PDF Objekt für Objekt direkt in eine Datei.
+
+    Seiteninhalte kommen als fertige Content-Streams; Schriften, das
+    Formular-XObject und der Seitenbaum werden beim Abschluss ergänzt.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = array("q", [0] * FORM)
+        self.kids = array("l")
+        self._position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.f.write(data)
+        self._position += len(data)
+
+    def reserve(self):
+        self.offsets.append(0)
+        return len(self.offsets)
+
+    def write_object(self, number, body):
+        self.offsets[number - 1] = self._position
+        self._write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def write_stream(self, number, content, extra=""):
+        data = zlib.compress(content)
+        head = f"<< /Filter /FlateDecode /Length {len(data)} {extra}>>\nstream\n".encode("ascii")
+        self.write_object(number, head + data + b"\nendstream")
+
+    def add_page(self, content, position=None):
+        """Schreibt eine Seite und liefert ihre Objektnummer.
+
+        Ohne position wird die Seite angehängt, sonst an dieser Stelle im
+        Seitenbaum eingefügt (für Übersicht und Verzeichnis).
+        """
+        stream = self.reserve()
+        page = self.reserve()
+        self.write_stream(stream, content)
+        width, height = template.PAGE_WIDTH, template.PAGE_HEIGHT
+        self.write_object(page, (
+            f"<< /Type /Page /Parent {PAGES} 0 R /MediaBox [0 0 {width:.4f} {height:.4f}] "
+            f"/Resources {RESOURCES} 0 R /Contents {stream} 0 R >>"
+        ).encode("ascii"))
+        if position is None:
+            self.kids.append(page)
+        else:
+            self.kids.insert(position, page)
+        return page
+
+    def close(self, fonts, outline_items):
+        """Schreibt Ressourcen, Lesezeichen, Seitenbaum, Katalog und Xref."""
+        font_refs = []
+        for font_name, internal_name in fonts.items():
+            number = self.reserve()
+            self.write_object(number, (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{font_name} "
+                f"/Name {internal_name} /Encoding /WinAnsiEncoding >>"
+            ).encode("ascii"))
+            font_refs.append(f"{internal_name} {number} 0 R")
+        self.write_object(FONTS, ("<< " + " ".join(font_refs) + " >>").encode("ascii"))
+        xobject = xObjectName(template.STATIC_FORM_NAME)
+        self.write_object(RESOURCES, (
+            f"<< /Font {FONTS} 0 R /XObject << /{xobject} {FORM} 0 R >> "
+            f"/ProcSet [/PDF /Text] >>"
+        ).encode("ascii"))
+
+        outlines = self._write_outlines(outline_items)
+
+        kids = " ".join(f"{n} 0 R" for n in self.kids)
+        self.write_object(PAGES, f"<< /Type /Pages /Count {len(self.kids)} /Kids [{kids}] >>".encode("ascii"))
+        catalog = f"<< /Type /Catalog /Pages {PAGES} 0 R"
+        if outlines:
+            catalog += f" /Outlines {outlines} 0 R /PageMode /UseOutlines"
+        self.write_object(CATALOG, (catalog + " >>").encode("ascii"))
+
+        xref = self._position
+        self._write(f"xref\n0 {len(self.offsets) + 1}\n0000000000 65535 f \n".encode("ascii"))
+        for offset in self.offsets:
+            self._write(f"{offset:010d} 00000 n \n".encode("ascii"))
+        self._write((
+            f"trailer\n<< /Size {len(self.offsets) + 1} /Root {CATALOG} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n"
+        ).encode("ascii"))
+
+    def _write_outlines(self, items):
+        """items: Iterator über (Titel, Seitenobjekt); liefert die Outline-Wurzel."""
+        root = self.reserve()
+        first = None
+        count = 0
+        pending = None  # (Objektnummer, Titel, Seite, Vorgänger), wartet auf /Next
+        for title, page in items:
+            number = self.reserve()
+            if pending:
+                self._write_outline_item(root, *pending, next_number=number)
+            else:
+                first = number
+            pending = (number, title, page, pending[0] if pending else None)
+            count += 1
+        if not pending:
+            return None
+        self._write_outline_item(root, *pending, next_number=None)
+        self.write_object(root, (
+            f"<< /Type /Outlines /First {first} 0 R /Last {pending[0]} 0 R /Count {count} >>"
+        ).encode("ascii"))
+        return root
+
+    def _write_outline_item(self, root, number, title, page, prev_number, next_number):
+        body = f"<< /Title {_pdf_text(title)} /Parent {root} 0 R /Dest [{page} 0 R /Fit]"
+        if prev_number:
+            body += f" /Prev {prev_number} 0 R"
+        if next_number:
+            body += f" /Next {next_number} 0 R"
+        self.write_object(number, (body + " >>").encode("ascii"))
+
+
+class PageRenderer:
+    """Erzeugt Content-Streams über einen einzigen, wiederverwendeten Canvas.
+
+    Der Canvas dient nur zum Übersetzen der Zeichenbefehle; seine Seiten
+    werden nie abgeschlossen, dadurch sammelt er keine Seiten im Speicher.
+    """
+
+    def __init__(self):
+        self.canvas = canvas.Canvas(None, pagesize=template.A4, invariant=1)
+
+    def capture(self, draw, *args):
+        c = self.canvas
+        c._restartAccumulators()
+        c.init_graphics_state()
+        draw(c, *args)
+        code = "\n".join([c._preamble] + c._code) + " "
+        return code.encode("latin-1")
+
+    def fonts(self):
+        """Liefert die benutzten Schriften; andere Ressourcen werden abgelehnt.
+
+        StreamingPdfWriter schreibt nur Standardschriften und das
+        Formular-XObject in /Resources. Bilder, ExtGStates (Transparenz)
+        oder eingebettete Schriften würden Seiten mit fehlenden Ressourcen
+        ergeben, daher wird in diesem Fall abgebrochen.
+        """
+        doc = self.canvas._doc
+        mapping = doc.fontMapping
+        for font_name in mapping:
+            if font_name not in pdfmetrics.standardFonts:
+                raise ValueError(f"Nur Standardschriften werden unterstützt: {font_name}")
+        font_ids = {internal_name.lstrip("/") for internal_name in mapping.values()}
+        unsupported = sorted(name for name in doc.idToObject if name != "BasicFonts" and name not in font_ids)
+        if self.canvas._extgstate._d:
+            unsupported.append("ExtGState")
+        if unsupported:
+            raise ValueError(f"Nicht unterstützte PDF-Ressourcen im Bericht: {', '.join(unsupported)}")
+        return dict(mapping)
+
+
+def _draw_beleg(c, bewirtungsart, values):
+    c.doForm(template.STATIC_FORM_NAME)
+    template.run_ops(c, template.compiled_variant(bewirtungsart))
+    template.draw_values(c, values)
+
+
+def _draw_summary(c, title, totals, counts, failed):
+    width, height = template.PAGE_WIDTH, template.PAGE_HEIGHT
+    margin = template.MARGIN
+    c.setFont("Helvetica", 18)
+    c.setFillColorRGB(0.2, 0.45, 0.75)
+    c.drawString(margin, height - 70, "Bewirtungsbelege – Übersicht")
+    c.setFont("Helvetica", 12)
+    c.setFillColorRGB(0.2, 0.2, 0.2)
+    if title:
+        c.drawString(margin, height - 92, title)
+
+    # Bewirtungsart linksbündig, Anzahl und Beträge rechtsbündig
+    right = width - margin
+    edges = [right - 78 * i for i in reversed(range(len(AMOUNT_FIELDS)))]
+    edges.insert(0, edges[0] - 55)
+    y = height - 140
+
+    def draw_row(cells):
+        c.drawString(margin, y, cells[0])
+        for x, cell in zip(edges, cells[1:]):
+            c.drawRightString(x, y, cell)
+
+    c.setFont("Helvetica-Bold", 9)
+    draw_row(["Bewirtungsart", "Anzahl"] + [label for _, label in AMOUNT_FIELDS])
+    c.setStrokeColorRGB(0.85, 0.85, 0.85)
+    c.setLineWidth(1)
+    c.line(margin, y - 6, right, y - 6)
+
+    c.setFont("Helvetica", 9)
+    rows = [(template.VARIANTEN[name], name) for name in template.VARIANTEN] + [("Gesamt", None)]
+    for label, name in rows:
+        y -= 22
+        if name is None:
+            c.line(margin, y + 14, right, y + 14)
+            c.setFont("Helvetica-Bold", 9)
+            count = sum(counts.values())
+            sums = [sum(totals[n][field] for n in totals) for field, _ in AMOUNT_FIELDS]
+        else:
+            count = counts[name]
+            sums = [totals[name][field] for field, _ in AMOUNT_FIELDS]
+        draw_row([label, str(count)] + [template.format_betrag(value) + " €" for value in sums])
+
+    c.setFont("Helvetica", 9)
+    c.setFillColorRGB(0.5, 0.5, 0.5)
+    c.drawString(margin, y - 40, "Die einzelnen Belege sind im Belegverzeichnis und über die Lesezeichen aufgeführt.")
+    if failed:
+        c.setFillColorRGB(0.75, 0.2, 0.2)
+        c.drawString(margin, y - 56, f"{failed} Datensätze konnten nicht verarbeitet werden.")
+    c.setFillColorRGB(0, 0, 0)
+
+
+def _fit(c, text, font_name, font_size, width):
+    """Kürzt text mit "…", bis er in width passt."""
+    if c.stringWidth(text, font_name, font_size) <= width:
+        return text
+    while text and c.stringWidth(text + " …", font_name, font_size) > width:
+        text = text[:-1]
+    return text.rstrip() + " …"
+
+
+def _draw_index(c, title, rows, page_index, page_count):
+    """Eine Seite des Belegverzeichnisses; rows: (Nr., Bezeichnung, Art, Gesamt, Seite)."""
+    width, height = template.PAGE_WIDTH, template.PAGE_HEIGHT
+    margin = template.MARGIN
+    right = width - margin
+    c.setFont("Helvetica", 18)
+    c.setFillColorRGB(0.2, 0.45, 0.75)
+    heading = "Belegverzeichnis"
+    if page_count > 1:
+        heading += f" ({page_index + 1}/{page_count})"
+    c.drawString(margin, height - 70, heading)
+    c.setFont("Helvetica", 12)
+    c.setFillColorRGB(0.2, 0.2, 0.2)
+    if title:
+        c.drawString(margin, height - 92, title)
+
+    # Nr., Bezeichnung und Art linksbündig, Betrag und Seite rechtsbündig
+    columns = [margin, margin + 36, right - 190]
+    amount_x, page_x = right - 50, right
+    y = height - 130
+
+    c.setFont("Helvetica-Bold", 9)
+    for x, label in zip(columns, ("Nr.", "Beleg", "Bewirtungsart")):
+        c.drawString(x, y, label)
+    c.drawRightString(amount_x, y, "Gesamt")
+    c.drawRightString(page_x, y, "Seite")
+    c.setStrokeColorRGB(0.85, 0.85, 0.85)
+    c.setLineWidth(1)
+    c.line(margin, y - 6, right, y - 6)
+
+    c.setFont("Helvetica", 9)
+    label_width = columns[2] - columns[1] - 10
+    for number, label, art, betrag, page in rows:
+        y -= 15
+        c.drawString(columns[0], y, str(number))
+        c.drawString(columns[1], y, _fit(c, label, "Helvetica", 9, label_width))
+        c.drawString(columns[2], y, art)
+        c.drawRightString(amount_x, y, f"{betrag} €" if betrag else "")
+        c.drawRightString(page_x, y, str(page))
+    c.setFillColorRGB(0, 0, 0)
+
+
+def write_report(records, out, title=""):
+    """Schreibt den Bericht für records (Iterator wie batch.read_records) nach out.
+
+    Das PDF entsteht zunächst in einer temporären Datei neben out und
+    ersetzt out erst nach erfolgreichem Abschluss; bei einem Abbruch bleibt
+    keine halbe Datei zurück.
+
+    Liefert (Anzahl Belege, Liste fehlgeschlagener Zeilen).
+    """
+    renderer = PageRenderer()
+    totals = {name: {field: Decimal(0) for field, _ in AMOUNT_FIELDS} for name in template.VARIANTEN}
+    counts = {name: 0 for name in template.VARIANTEN}
+    failures = []
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".report-", suffix=".pdf.tmp", dir=os.path.dirname(os.path.abspath(out))
+    )
+    try:
+        with os.fdopen(fd, "wb") as f, tempfile.TemporaryFile("w+", encoding="utf-8") as bookmarks:
+            writer = StreamingPdfWriter(f)
+            writer.write_stream(FORM, renderer.capture(template.draw_form), (
+                f"/Type /XObject /Subtype /Form /FormType 1 "
+                f"/BBox [0 0 {template.PAGE_WIDTH:.4f} {template.PAGE_HEIGHT:.4f}] "
+                f"/Resources << /Font {FONTS} 0 R /ProcSet [/PDF /Text] >> "
+            ))
+
+            for lineno, record, error in records:
+                try:
+                    if error:
+                        raise ValueError(error)
+                    bewirtungsart, values = template.normalize_record(record)
+                    # normalize_record hat die Beträge bereits geprüft und formatiert
+                    amounts = {field: template.parse_betrag(values[field]) for field, _ in AMOUNT_FIELDS}
+                except ValueError as e:
+                    failures.append((lineno, str(e)))
+                    continue
+                page = writer.add_page(renderer.capture(_draw_beleg, bewirtungsart, values))
+                for field, value in amounts.items():
+                    totals[bewirtungsart][field] += value
+                counts[bewirtungsart] += 1
+                label = " – ".join(part for part in (values["datum"], values["ort"]) if part)
+                bookmarks.write(json.dumps(
+                    [label or f"Beleg {lineno}", page, bewirtungsart, values["gesamtbetrag"]]
+                ) + "\n")
+
+            summary = writer.add_page(
+                renderer.capture(_draw_summary, title, totals, counts, len(failures)), position=0
+            )
+
+            # Verzeichnis direkt hinter der Übersicht; Belege beginnen danach
+            receipt_count = sum(counts.values())
+            index_count = -(-receipt_count // INDEX_ROWS)
+            index_pages = []
+            bookmarks.seek(0)
+            for index_page in range(index_count):
+                rows = []
+                for offset in range(INDEX_ROWS):
+                    line = bookmarks.readline()
+                    if not line:
+                        break
+                    label, _, bewirtungsart, betrag = json.loads(line)
+                    number = index_page * INDEX_ROWS + offset + 1
+                    rows.append((number, label, template.VARIANTEN[bewirtungsart], betrag,
+                                 1 + index_count + number))
+                index_pages.append(writer.add_page(
+                    renderer.capture(_draw_index, title, rows, index_page, index_count),
+                    position=1 + index_page,
+                ))
+
+            def outline_items():
+                yield "Übersicht", summary
+                if index_pages:
+                    yield "Belegverzeichnis", index_pages[0]
+                bookmarks.seek(0)
+                for line in bookmarks:
+                    label, page, _, _ = json.loads(line)
+                    yield label, page
+
+            writer.close(renderer.fonts(), outline_items())
+
+        os.replace(tmp_path, out)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return sum(counts.values()), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erstellt einen Monatsbericht aus Bewirtungsbelegen.")
+    parser.add_argument("input", help="JSONL-Datei mit einem Beleg pro Zeile oder '-' für stdin")
+    parser.add_argument("--out", required=True, help="Ausgabedatei (PDF)")
+    parser.add_argument("--title", default="", help="Untertitel der Übersicht, z. B. 'Oktober 2025'")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        rendered, failures = write_report(read_records(stream), args.out, args.title)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {rendered} Belege in {elapsed:.2f}s nach {args.out} geschrieben", file=sys.stderr)
+    if failures:
+        print(f"❌ {len(failures)} Datensätze fehlgeschlagen", file=sys.stderr)
+        for lineno, error in failures[:10]:
+            print(f"   Zeile {lineno}: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,180 +1,537 @@
+import io
+import os
+import re
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
 from reportlab.pdfgen import canvas
 from reportlab.graphics import renderPDF
 from svglib.svglib import svg2rlg
 
-def draw_form(c):
-    width, height = A4
-    margin = 40
-    line_height = 28
-    y = height - 90
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(TEMPLATE_DIR, "docbits.svg")  # <- Pfad zu deinem Logo
+LOGO_SCALE = 0.2  # ggf. anpassen
 
-    # ===== Logo oben rechts =====
-    logo_path = "docbits.svg"  # <- Pfad zu deinem Logo
-    try:
-        drawing = svg2rlg(logo_path)
-        scale = 0.2  # ggf. anpassen
-        drawing.width *= scale
-        drawing.height *= scale
-        drawing.scale(scale, scale)
+# Name des Form XObjects mit dem statischen Teil des Formulars
+STATIC_FORM_NAME = "Bewirtungsformular"
 
-        renderPDF.draw(drawing, c, 40, height - 60)  # Position oben links
-    except Exception as e:
-        print("Fehler beim Laden des Logos:", e)
 
-    # Titel
-    c.setFont("Helvetica", 18)
-    c.setFillColorRGB(1, 1, 1)
-    c.drawCentredString(width / 2, height - 45, "Bewirtungsformular")
-    c.setFillColorRGB(0, 0, 0)
-    y -= 10
-
-    # Firma / Mitarbeiter
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.setFont("Helvetica", 12)
-    c.drawString(margin, y, "Firma / Mitarbeiter:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 150, y - 2, width - margin, y - 2)
-    y -= line_height
-    y -= 10
-
-    # Datum (ohne Uhrzeit)
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Datum:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 50, y - 2, width - margin, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-    y -= line_height
-    y -= 10
-
-    # Ort
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Ort der Bewirtung:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 130, y - 2, width - margin, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-    y -= line_height
-    y -= 10
-
-    # Anlass (mehrzeilig!)
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Anlass der Bewirtung:")
-    y -= line_height
-    for _ in range(3):
-        c.setStrokeColorRGB(0.85, 0.85, 0.85)
-        c.setLineWidth(1)
-        c.line(margin, y - 2, width - margin, y - 2)
-        c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-        y -= line_height
-    y -= line_height / 2
-    y -= 10
-
-    # Teilnehmer
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.setFont("Helvetica", 12)
-    c.drawString(margin, y, "Teilnehmer (Name & Firma):")
-    y -= 10
-    c.setStrokeColorRGB(0.9, 0.9, 0.9)
-    c.setLineWidth(0.5)
-    c.line(margin, y - 6, width - margin, y - 6)
-    y -= line_height
-
-    for _ in range(5):
-        c.setStrokeColorRGB(0.85, 0.85, 0.85)
-        c.setLineWidth(1)
-        c.line(margin, y - 2, width - margin, y - 2)
-        c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-        y -= line_height
-
-    y -= line_height / 2
-    y -= 10
-
-    # Betrag
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Gesamtkosten €:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 120, y - 2, margin + 250, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-    y -= line_height * 1.5
-    y -= 10
-
-    # Zusätzliche Felder
-    c.drawString(margin, y, "Netto:")
-    c.line(margin + 50, y - 2, margin + 180, y - 2)
-    c.drawString(margin + 250, y, "MwSt.:")
-    c.line(margin + 300, y - 2, width - margin, y - 2)
-    y -= line_height
-    y -= 10
-
-    c.drawString(margin, y, "Trinkgeld:")
-    c.line(margin + 70, y - 2, margin + 180, y - 2)
-    c.drawString(margin + 250, y, "MwSt. Trinkgeld:")
-    c.line(margin + 370, y - 2, width - margin, y - 2)
-    y -= line_height
-    y -= 10
-
-    # Zahlungsart
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Zahlungsart:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 150, y - 2, width - margin, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-    y -= line_height
-    y -= 10
-
-    # Unterschrift
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.drawString(margin, y, "Unterschrift:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 90, y - 2, margin + 250, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
-
-    c.drawString(margin + 300, y, "Ort / Datum:")
-    c.setStrokeColorRGB(0.85, 0.85, 0.85)
-    c.setLineWidth(1)
-    c.line(margin + 380, y - 2, width - margin, y - 2)
-    c.setStrokeColorRGB(0, 0, 0)  # danach wieder zurück
+@lru_cache(maxsize=None)
+def load_logo(logo_path=LOGO_PATH, scale=LOGO_SCALE):
+    """Parst das SVG-Logo einmal pro Prozess und liefert die skalierte Zeichnung."""
+    drawing = svg2rlg(logo_path)
+    if drawing is None:
+        raise ValueError(f"Logo konnte nicht gelesen werden: {logo_path}")
+    drawing.width *= scale
+    drawing.height *= scale
+    drawing.scale(scale, scale)
+    return drawing
+
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 40
+LINE_HEIGHT = 28
+RIGHT = PAGE_WIDTH - MARGIN
+
+# Stile: Text braucht Schrift + Füllfarbe, Linien Strichfarbe + Breite
+TITLE_STYLE = {"font": ("Helvetica", 18), "fill": (1, 1, 1)}
+LABEL_STYLE = {"font": ("Helvetica", 12), "fill": (0.2, 0.2, 0.2)}
+FOOTER_TEXT_STYLE = {"font": ("Helvetica", 8), "fill": (0.5, 0.5, 0.5)}
+VARIANT_STYLE = {"font": ("Helvetica-Oblique", 14), "fill": (0.2, 0.45, 0.75)}
+RULE = {"stroke": (0.85, 0.85, 0.85), "width": 1}
+RULE_DARK = {"stroke": (0, 0, 0), "width": 1}  # Betragszeilen sind seit jeher schwarz
+SEPARATOR = {"stroke": (0.9, 0.9, 0.9), "width": 0.5}
+FOOTER_RULE = {"stroke": (0.9, 0.9, 0.9), "width": 0.75}
+
+# Aufbau des Formulars von oben nach unten.
+#   ("row", [(feld, label, label_x, linie_x, linie_ende), ...], linienstil, vorschub)
+#   ("block", feld, label, anzahl_linien, mit_trennlinie)
+# x-Werte sind relativ zum Rand, linie_ende None bedeutet bis zum rechten Rand.
+FORM_LAYOUT = [
+    ("row", [("firma", "Firma / Mitarbeiter:", 0, 150, None)], RULE, LINE_HEIGHT + 10),
+    ("row", [("datum", "Datum:", 0, 50, None)], RULE, LINE_HEIGHT + 10),
+    ("row", [("ort", "Ort der Bewirtung:", 0, 130, None)], RULE, LINE_HEIGHT + 10),
+    ("block", "anlass", "Anlass der Bewirtung:", 3, False),
+    ("block", "teilnehmer", "Teilnehmer (Name & Firma):", 5, True),
+    ("row", [("gesamtbetrag", "Gesamtkosten €:", 0, 120, 250)], RULE, LINE_HEIGHT * 1.5 + 10),
+    ("row", [
+        ("gesamtbetragNetto", "Netto:", 0, 50, 180),
+        ("gesamtbetragMwst", "MwSt.:", 250, 300, None),
+    ], RULE_DARK, LINE_HEIGHT + 10),
+    ("row", [
+        ("trinkgeld", "Trinkgeld:", 0, 70, 180),
+        ("trinkgeldMwst", "MwSt. Trinkgeld:", 250, 370, None),
+    ], RULE_DARK, LINE_HEIGHT + 10),
+    ("row", [("zahlungsart", "Zahlungsart:", 0, 150, None)], RULE, LINE_HEIGHT + 10),
+    ("row", [
+        ("unterschrift", "Unterschrift:", 0, 90, 250),
+        ("ortDatum", "Ort / Datum:", 300, 380, None),
+    ], RULE, 0),
+]
+
+# Abschnitte für die Instrumentierung (siehe instrumentation.py)
+FIELD_SECTIONS = {
+    "firma": "header",
+    "datum": "header",
+    "ort": "header",
+    "anlass": "anlass",
+    "teilnehmer": "teilnehmer",
+    "gesamtbetrag": "amounts",
+    "gesamtbetragNetto": "amounts",
+    "gesamtbetragMwst": "amounts",
+    "trinkgeld": "amounts",
+    "trinkgeldMwst": "amounts",
+    "zahlungsart": "amounts",
+    "unterschrift": "signature",
+    "ortDatum": "signature",
+}
+
+# Varianten: Name -> Überschrift oben rechts
+VARIANTEN = {
+    "kunden": "Kundenbewirtung",
+    "mitarbeiter": "Mitarbeiterbewirtung",
+}
+
+
+class _OpCompiler:
+    """Sammelt Zeichenoperationen und gibt Zustandswechsel nur bei Änderung aus."""
+
+    def __init__(self):
+        self.ops = []
+        self.state = {}
+        self.sections = []
+
+    def section(self, name):
+        """Beginnt einen Abschnitt; gleichnamige Folgeaufrufe setzen ihn fort."""
+        if self.sections and self.sections[-1][0] == name:
+            return
+        if self.sections:
+            self.sections[-1][2] = len(self.ops)
+        self.sections.append([name, len(self.ops), None])
+
+    def finish_sections(self):
+        if self.sections:
+            self.sections[-1][2] = len(self.ops)
+        return [tuple(section) for section in self.sections]
+
+    def _use(self, style):
+        for key, value in style.items():
+            if self.state.get(key) != value:
+                self.state[key] = value
+                self.ops.append((key, value))
+
+    def text(self, kind, style, x, y, text):
+        self._use(style)
+        self.ops.append((kind, (x, y, text)))
+
+    def line(self, style, x1, y1, x2, y2):
+        self._use(style)
+        self.ops.append(("line", (x1, y1, x2, y2)))
+
+    def logo(self, x, y):
+        # renderPDF kapselt das Logo in saveState/restoreState
+        self.ops.append(("logo", (x, y)))
+
+
+def compile_layout(layout=FORM_LAYOUT):
+    """Übersetzt die Layoutbeschreibung in (Operationen, Feldpositionen, Abschnitte).
+
+    Die Feldpositionen sind Listen von (x, y, x_ende) je Feld: y ist die
+    Grundlinie des Labels, x/x_ende begrenzen die zugehörige Linie.
+    Abschnitte sind (Name, Start, Ende) als Indexbereiche in die Operationen.
+    """
+    out = _OpCompiler()
+    slots = {}
+
+    out.section("logo")
+    out.logo(40, PAGE_HEIGHT - 60)  # Position oben links
+    out.section("header")
+    out.text("ctext", TITLE_STYLE, PAGE_WIDTH / 2, PAGE_HEIGHT - 45, "Bewirtungsformular")
+
+    y = PAGE_HEIGHT - 100
+    for entry in layout:
+        kind = entry[0]
+        if kind == "row":
+            _, fields, rule, advance = entry
+            out.section(FIELD_SECTIONS[fields[0][0]])
+            for name, label, label_x, line_x, line_end in fields:
+                x_end = RIGHT if line_end is None else MARGIN + line_end
+                out.text("text", LABEL_STYLE, MARGIN + label_x, y, label)
+                out.line(rule, MARGIN + line_x, y - 2, x_end, y - 2)
+                slots[name] = [(MARGIN + line_x, y, x_end)]
+            y -= advance
+        elif kind == "block":
+            _, name, label, count, separator = entry
+            out.section(FIELD_SECTIONS[name])
+            out.text("text", LABEL_STYLE, MARGIN, y, label)
+            if separator:
+                y -= 10
+                out.line(SEPARATOR, MARGIN, y - 6, RIGHT, y - 6)
+            y -= LINE_HEIGHT
+            slots[name] = []
+            for _ in range(count):
+                out.line(RULE, MARGIN, y - 2, RIGHT, y - 2)
+                slots[name].append((MARGIN, y, RIGHT))
+                y -= LINE_HEIGHT
+            y -= LINE_HEIGHT / 2 + 10
+        else:
+            raise ValueError(f"Unbekannter Layout-Eintrag: {kind}")
 
     # Fußzeile
-    c.setFont("Helvetica", 8)
-    c.setFillColorRGB(0.5, 0.5, 0.5)
-    c.setStrokeColorRGB(0.9, 0.9, 0.9)
-    c.setLineWidth(0.75)
-    c.line(margin, 50, width - margin, 50)
-    c.drawRightString(width - 40, 40, "Dieses Formular wurde mit DocBits erstellt")
-    c.setFillColorRGB(0, 0, 0)
+    out.section("footer")
+    out.line(FOOTER_RULE, MARGIN, 50, RIGHT, 50)
+    out.text("rtext", FOOTER_TEXT_STYLE, PAGE_WIDTH - 40, 40, "Dieses Formular wurde mit DocBits erstellt")
+    out._use({"fill": (0, 0, 0)})
+    return out.ops, slots, out.finish_sections()
+
+
+def compile_variant(title):
+    """Operationen für die Überschrift einer Variante oben rechts."""
+    out = _OpCompiler()
+    out.text("rtext", VARIANT_STYLE, PAGE_WIDTH - 40, PAGE_HEIGHT - 40, title)
+    out._use({"fill": (0, 0, 0)})
+    return out.ops
+
+
+def _draw_logo(c, pos):
+    try:
+        renderPDF.draw(load_logo(), c, *pos)
+    except Exception as e:
+        # stderr, da stdout im Worker der Protokollkanal ist
+        print("Fehler beim Laden des Logos:", e, file=sys.stderr)
+
+
+_OP_HANDLERS = {
+    "font": lambda c, arg: c.setFont(*arg),
+    "fill": lambda c, arg: c.setFillColorRGB(*arg),
+    "stroke": lambda c, arg: c.setStrokeColorRGB(*arg),
+    "width": lambda c, arg: c.setLineWidth(arg),
+    "text": lambda c, arg: c.drawString(*arg),
+    "ctext": lambda c, arg: c.drawCentredString(*arg),
+    "rtext": lambda c, arg: c.drawRightString(*arg),
+    "line": lambda c, arg: c.line(*arg),
+    "logo": _draw_logo,
+}
+
+
+def run_ops(c, ops):
+    for op, arg in ops:
+        _OP_HANDLERS[op](c, arg)
+
+
+@lru_cache(maxsize=None)
+def compiled_form():
+    return compile_layout()
+
+
+@lru_cache(maxsize=None)
+def compiled_variant(bewirtungsart):
+    return compile_variant(VARIANTEN[bewirtungsart])
+
+
+def field_slots():
+    """Liefert die Schreibpositionen der Felder, wie sie draw_form() anlegt."""
+    return compiled_form()[1]
+
+
+# Version des Feldbereich-Exports; bei Layoutänderungen erhöhen
+FIELD_REGIONS_VERSION = 1
+
+# Ränder der Feldbereiche um die Grundlinie, in Punkt
+REGION_ABOVE = 16
+REGION_BELOW = 6
+
+
+def field_labels(layout=FORM_LAYOUT):
+    labels = {}
+    for entry in layout:
+        if entry[0] == "row":
+            for name, label, *_ in entry[1]:
+                labels[name] = label
+        else:
+            labels[entry[1]] = entry[2]
+    return labels
+
+
+def field_regions():
+    """Liefert die Feldbereiche aller Varianten als JSON-fähiges Dict.
+
+    Je Feld gibt es das Rechteck in PDF-Punkten (Ursprung unten links) und
+    eine normierte Box (0-1, Ursprung oben links) wie BoundingBox im Frontend.
+    """
+    labels = field_labels()
+    fields = {}
+    for name, slots in field_slots().items():
+        x0 = min(x for x, _, _ in slots)
+        x1 = max(x_end for _, _, x_end in slots)
+        y0 = min(y for _, y, _ in slots) - REGION_BELOW
+        y1 = max(y for _, y, _ in slots) + REGION_ABOVE
+        fields[name] = {
+            "label": labels[name],
+            "lines": len(slots),
+            "pdf": {"x0": round(x0, 2), "y0": round(y0, 2), "x1": round(x1, 2), "y1": round(y1, 2)},
+            "box": {
+                "x": round(x0 / PAGE_WIDTH, 4),
+                "y": round((PAGE_HEIGHT - y1) / PAGE_HEIGHT, 4),
+                "width": round((x1 - x0) / PAGE_WIDTH, 4),
+                "height": round((y1 - y0) / PAGE_HEIGHT, 4),
+            },
+        }
+    return {
+        "version": FIELD_REGIONS_VERSION,
+        "page": {"width": round(PAGE_WIDTH, 2), "height": round(PAGE_HEIGHT, 2), "unit": "pt"},
+        "variants": {
+            name: {"title": title, "fields": fields}
+            for name, title in VARIANTEN.items()
+        },
+    }
+
+
+def draw_form(c, stats=None):
+    """Zeichnet den statischen Teil des Formulars direkt in den aktuellen Grafikstrom."""
+    ops, _, sections = compiled_form()
+    if stats is None:
+        run_ops(c, ops)
+        return
+    for name, start, end in sections:
+        with stats.section(name, end - start):
+            run_ops(c, ops[start:end])
+
+
+def draw_static_form(c, stats=None):
+    """Platziert den statischen Teil des Formulars als Form XObject.
+
+    Das XObject wird beim ersten Aufruf pro Canvas kompiliert; alle weiteren
+    Seiten und Varianten desselben Dokuments referenzieren es nur noch.
+    """
+    if not c.hasForm(STATIC_FORM_NAME):
+        c.beginForm(STATIC_FORM_NAME)
+        draw_form(c, stats)
+        c.endForm()
+    c.doForm(STATIC_FORM_NAME)
+
+def draw_variant(c, bewirtungsart, stats=None):
+    """Zeichnet das Formular der Variante: statisches XObject plus Überschrift."""
+    draw_static_form(c, stats)
+    ops = compiled_variant(bewirtungsart)
+    if stats is None:
+        run_ops(c, ops)
+    else:
+        with stats.section("header", len(ops)):
+            run_ops(c, ops)
 
 def draw_kundenbewirtung_form(c):
-    draw_form(c)
-    width, height = A4
-    c.setFont("Helvetica-Oblique", 14)
-    c.setFillColorRGB(0.2, 0.45, 0.75)
-    c.drawRightString(width - 40, height - 40, "Kundenbewirtung")
-    c.setFillColorRGB(0, 0, 0)
+    draw_variant(c, "kunden")
 
 def draw_mitarbeiterbewirtung_form(c):
-    draw_form(c)
-    width, height = A4
-    c.setFont("Helvetica-Oblique", 14)
-    c.setFillColorRGB(0.2, 0.45, 0.75)
-    c.drawRightString(width - 40, height - 40, "Mitarbeiterbewirtung")
+    draw_variant(c, "mitarbeiter")
+
+# Anzeigetexte wie im Web-Formular
+ZAHLUNGSARTEN = {
+    "firma": "Firmenkreditkarte",
+    "privat": "Private Kreditkarte",
+    "bar": "Bar",
+}
+
+VALUE_FONT = ("Helvetica", 11)
+
+
+def format_betrag(value):
+    """Formatiert Beträge im deutschen Format; Strings werden unverändert übernommen."""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (int, float, Decimal)):
+        return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return str(value)
+
+
+BETRAG_PATTERN = re.compile(r"\d{1,3}(\.\d{3})*(,\d+)?|\d+(,\d+)?")
+
+
+def parse_betrag(value):
+    """Liest einen Betrag als Decimal; Strings im deutschen Format ("1.234,56")."""
+    if value is None or value == "":
+        return Decimal(0)
+    # bool ist eine int-Unterklasse, Decimal("True") wäre aber kein ValueError
+    if isinstance(value, bool):
+        raise ValueError(f"Ungültiger Betrag: {value}")
+    if isinstance(value, (int, float, Decimal)):
+        amount = Decimal(str(value))
+        if not amount.is_finite():
+            raise ValueError(f"Ungültiger Betrag: {value}")
+        return amount
+    text = str(value).replace("€", "").strip()
+    # "12.50" wäre sonst 1.250,00 € – nur Tausenderpunkte im deutschen Format zulassen
+    if not BETRAG_PATTERN.fullmatch(text):
+        raise ValueError(f"Ungültiger Betrag: {value}")
+    try:
+        return Decimal(text.replace(".", "").replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"Ungültiger Betrag: {value}")
+
+
+# Betragsfelder eines Belegs in der Reihenfolge des Formulars
+BETRAG_FIELDS = ("gesamtbetrag", "gesamtbetragNetto", "gesamtbetragMwst", "trinkgeld", "trinkgeldMwst")
+
+
+def _betrag_text(value):
+    """Prüft einen Betrag und liefert ihn einheitlich formatiert ("12,5" -> "12,50")."""
+    if value is None or value == "":
+        return ""
+    return format_betrag(parse_betrag(value))
+
+
+def _text(value):
+    """Feldtext aus einem JSON-Wert; null ergibt ein leeres Feld statt "None"."""
+    return "" if value is None else str(value)
+
+
+def normalize_record(record):
+    """Prüft einen Beleg-Datensatz und liefert die Feldtexte für das Formular.
+
+    Ungültige Beträge lösen hier einen ValueError aus, damit Batch, Worker
+    und Monatsbericht dieselben Datensätze annehmen und ablehnen.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Datensatz muss ein JSON-Objekt sein")
+    bewirtungsart = record.get("bewirtungsart", "kunden")
+    if bewirtungsart not in VARIANTEN:
+        raise ValueError(f"Unbekannte Bewirtungsart: {bewirtungsart}")
+    zahlungsart = record.get("zahlungsart", "")
+    if zahlungsart and zahlungsart not in ZAHLUNGSARTEN:
+        raise ValueError(f"Unbekannte Zahlungsart: {zahlungsart}")
+
+    teilnehmer = record.get("teilnehmer")
+    if isinstance(teilnehmer, (list, tuple)):
+        teilnehmer = "\n".join(str(t) for t in teilnehmer if t is not None)
+
+    return bewirtungsart, {
+        "firma": _text(record.get("firma")),
+        "datum": _text(record.get("datum")),
+        "ort": _text(record.get("ort")),
+        "anlass": _text(record.get("anlass")),
+        "teilnehmer": _text(teilnehmer),
+        **{field: _betrag_text(record.get(field)) for field in BETRAG_FIELDS},
+        "zahlungsart": ZAHLUNGSARTEN.get(zahlungsart, ""),
+    }
+
+
+def _draw_value(c, text, slots):
+    """Schreibt einen Feldtext auf seine Linien; liefert die Anzahl Zeilen."""
+    font_name, font_size = VALUE_FONT
+    lines = []
+    for paragraph in text.splitlines():
+        x, _, x_end = slots[len(lines) % len(slots)]
+        lines.extend(simpleSplit(paragraph, font_name, font_size, x_end - x - 5))
+    # Überzählige Zeilen werden abgeschnitten, die letzte Linie bekommt "…"
+    if len(lines) > len(slots):
+        lines = lines[:len(slots)]
+        lines[-1] = lines[-1].rstrip() + " …"
+    for (x, y, _), line in zip(slots, lines):
+        c.drawString(x + 5, y, line)
+    return len(lines)
+
+
+def draw_values(c, values, stats=None):
+    """Schreibt die Feldtexte auf die Linien des Formulars."""
+    c.setFont(*VALUE_FONT)
     c.setFillColorRGB(0, 0, 0)
+    for name, slots in field_slots().items():
+        text = values.get(name)
+        if not text:
+            continue
+        if stats is None:
+            _draw_value(c, text, slots)
+        else:
+            started = time.perf_counter()
+            ops = _draw_value(c, text, slots)
+            stats.record(FIELD_SECTIONS[name], time.perf_counter() - started, ops)
+
+
+def draw_record(c, record, stats=None):
+    """Zeichnet einen ausgefüllten Beleg als eine Seite auf den Canvas."""
+    bewirtungsart, values = normalize_record(record)
+    draw_variant(c, bewirtungsart, stats)
+    draw_values(c, values, stats)
+    c.showPage()
+
+
+def new_canvas(target):
+    """Erzeugt einen A4-Canvas mit deterministischer Ausgabe.
+
+    invariant=1 fixiert Erstellungsdatum und Dokument-ID, sodass gleiche
+    Eingaben byte-identische PDFs ergeben.
+    """
+    return canvas.Canvas(target, pagesize=A4, invariant=1)
+
+
+def render_pdf(record=None, bewirtungsart="kunden", stats=None):
+    """Rendert einen ausgefüllten Beleg oder ein leeres Formular in den Speicher.
+
+    Ohne record wird das leere Formular der angegebenen Bewirtungsart erzeugt.
+    Rückgabe sind die PDF-Bytes, es werden keine Dateien geschrieben. Mit
+    stats (instrumentation.RenderStats) werden Abschnittszeiten erfasst.
+    """
+    buffer = io.BytesIO()
+    c = new_canvas(buffer)
+    if record is None:
+        if bewirtungsart not in VARIANTEN:
+            raise ValueError(f"Unbekannte Bewirtungsart: {bewirtungsart}")
+        draw_variant(c, bewirtungsart, stats)
+        c.showPage()
+    else:
+        draw_record(c, record, stats)
+    if stats is None:
+        c.save()
+    else:
+        with stats.section("save"):
+            c.save()
+    return buffer.getvalue()
+
+
+def warm_up():
+    """Lädt Logo und Schriften vor, damit der erste echte Aufruf schnell ist.
+
+    Ein fehlendes oder defektes Logo ist kein Abbruchgrund; die Formulare
+    werden dann wie in batch.init_worker ohne Logo gezeichnet.
+    """
+    try:
+        load_logo()
+    except Exception as e:
+        print("Fehler beim Laden des Logos:", e, file=sys.stderr)
+    render_pdf()
+
 
 def create_pdf():
-    c1 = canvas.Canvas("kundenbewirtung.pdf", pagesize=A4)
+    c1 = new_canvas("kundenbewirtung.pdf")
     draw_kundenbewirtung_form(c1)
     c1.showPage()
     c1.save()
 
-    c2 = canvas.Canvas("mitarbeiterbewirtung.pdf", pagesize=A4)
+    c2 = new_canvas("mitarbeiterbewirtung.pdf")
     draw_mitarbeiterbewirtung_form(c2)
     c2.showPage()
     c2.save()
 
-create_pdf()
\ No newline at end of file
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Erzeugt die leeren Bewirtungsformulare.")
+    parser.add_argument("--regions", metavar="DATEI",
+                        help="Schreibt stattdessen die Feldbereiche als JSON ('-' für stdout)")
+    args = parser.parse_args()
+
+    if args.regions:
+        data = json.dumps(field_regions(), indent=2, ensure_ascii=False) + "\n"
+        if args.regions == "-":
+            print(data, end="")
+        else:
+            with open(args.regions, "w", encoding="utf-8") as f:
+                f.write(data)
+    else:
+        create_pdf()
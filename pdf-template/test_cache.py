@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Tests für den zweistufigen Render-Cache.
+
+Ausführen mit:
+    cd pdf-template && python -m unittest test_cache
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import template
+from cache import RenderCache, cache_key, render_cached
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RECORD = {
+    "firma": "DocBits GmbH",
+    "datum": "17.10.2025",
+    "ort": "Berlin",
+    "teilnehmer": ["Max Mustermann", "Erika Musterfrau"],
+    "gesamtbetrag": "123,45",
+    "zahlungsart": "firma",
+}
+
+
+def blob(char, size=10):
+    return char.encode("ascii") * size
+
+
+class MemoryTierTest(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted_first(self):
+        cache = RenderCache(max_memory_bytes=30)
+        for key in "abc":
+            cache.put(key, blob(key))
+        self.assertEqual(cache.get("a"), (blob("a"), "memory"))
+
+        cache.put("d", blob("d"))
+
+        self.assertEqual(cache.get("b"), (None, None))
+        for key in "acd":
+            self.assertEqual(cache.get(key)[1], "memory")
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["memory_evictions"], 1)
+        self.assertEqual(snapshot["memory_entries"], 3)
+        self.assertEqual(snapshot["memory_bytes"], 30)
+
+    def test_entries_larger_than_the_limit_are_not_kept(self):
+        cache = RenderCache(max_memory_bytes=5)
+        cache.put("a", blob("a"))
+        self.assertEqual(cache.get("a"), (None, None))
+        self.assertEqual(cache.snapshot()["memory_bytes"], 0)
+
+    def test_counters(self):
+        cache = RenderCache()
+        cache.get("a")
+        cache.put("a", blob("a"))
+        cache.get("a")
+        cache.get("a")
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["misses"], 1)
+        self.assertEqual(snapshot["memory_hits"], 2)
+        self.assertEqual(snapshot["disk_hits"], 0)
+
+
+class DiskTierTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = self.tmp.name
+
+    def disk_files(self):
+        return sorted(
+            name[:-4] for _, _, files in os.walk(self.cache_dir) for name in files if name.endswith(".pdf")
+        )
+
+    def test_disk_is_bounded_by_bytes(self):
+        # Speicherstufe zu klein für die Einträge, damit nur die Platte zählt
+        cache = RenderCache(self.cache_dir, max_memory_bytes=5, max_disk_bytes=25)
+        for key in ("aa", "bb", "cc"):
+            cache.put(key, blob(key[0]))
+
+        self.assertEqual(self.disk_files(), ["bb", "cc"])
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["disk_evictions"], 1)
+        self.assertEqual(snapshot["disk_bytes"], 20)
+
+    def test_disk_hit_is_promoted_to_memory(self):
+        RenderCache(self.cache_dir).put("aa", blob("a"))
+
+        cache = RenderCache(self.cache_dir)
+        self.assertEqual(cache.get("aa"), (blob("a"), "disk"))
+        self.assertEqual(cache.get("aa"), (blob("a"), "memory"))
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["disk_hits"], 1)
+        self.assertEqual(snapshot["memory_hits"], 1)
+        self.assertEqual(snapshot["memory_entries"], 1)
+
+    def test_reload_orders_entries_by_mtime(self):
+        first = RenderCache(self.cache_dir, max_memory_bytes=5)
+        for key in ("aa", "bb"):
+            first.put(key, blob(key[0]))
+        # "aa" zuletzt benutzt, "bb" ist damit der älteste Eintrag
+        os.utime(os.path.join(self.cache_dir, "aa", "aa.pdf"), (2000, 2000))
+        os.utime(os.path.join(self.cache_dir, "bb", "bb.pdf"), (1000, 1000))
+
+        reloaded = RenderCache(self.cache_dir, max_memory_bytes=5, max_disk_bytes=25)
+        self.assertEqual(reloaded.snapshot()["disk_entries"], 2)
+        self.assertEqual(reloaded.snapshot()["disk_bytes"], 20)
+        reloaded.put("cc", blob("c"))
+
+        self.assertEqual(self.disk_files(), ["aa", "cc"])
+
+    def test_missing_file_counts_as_miss(self):
+        cache = RenderCache(self.cache_dir, max_memory_bytes=5)
+        cache.put("aa", blob("a"))
+        os.remove(os.path.join(self.cache_dir, "aa", "aa.pdf"))
+
+        self.assertEqual(cache.get("aa"), (None, None))
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["misses"], 1)
+        self.assertEqual(snapshot["disk_entries"], 0)
+        self.assertEqual(snapshot["disk_bytes"], 0)
+
+
+class RenderCachedTest(unittest.TestCase):
+    def test_second_render_is_served_from_cache(self):
+        cache = RenderCache()
+        pdf, tier = render_cached(cache, RECORD)
+        self.assertIsNone(tier)
+        self.assertEqual(render_cached(cache, RECORD), (pdf, "memory"))
+        self.assertEqual(pdf, template.render_pdf(RECORD))
+
+    def test_key_ignores_bewirtungsart_for_filled_records(self):
+        self.assertEqual(cache_key(RECORD, "kunden"), cache_key(RECORD, "mitarbeiter"))
+        self.assertNotEqual(cache_key(None, "kunden"), cache_key(None, "mitarbeiter"))
+
+    def test_render_output_is_identical_across_processes(self):
+        # Voraussetzung dafür, dass der Platten-Cache zwischen Prozessen gültig ist
+        code = (
+            "import hashlib, json, sys, template; "
+            "print(hashlib.sha256(template.render_pdf(json.loads(sys.argv[1]))).hexdigest())"
+        )
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", code, json.dumps(RECORD)],
+                cwd=TEMPLATE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            for _ in range(2)
+        }
+        digests.add(hashlib.sha256(template.render_pdf(RECORD)).hexdigest())
+        self.assertEqual(len(digests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
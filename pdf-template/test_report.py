@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Tests für den Monatsbericht (report.py).
+
+Das erzeugte PDF wird ohne zusätzliche Bibliothek über Xref-Tabelle und
+Objekte geprüft.
+
+Ausführen mit:
+    cd pdf-template && python -m unittest test_report
+"""
+import os
+import re
+import tempfile
+import unittest
+
+import report
+import template
+
+
+def beleg(tag, **fields):
+    record = {
+        "firma": "DocBits GmbH",
+        "datum": f"{tag:02d}.10.2025",
+        "ort": "Berlin",
+        "gesamtbetrag": "100,00",
+        "gesamtbetragNetto": "84,03",
+        "gesamtbetragMwst": "15,97",
+        "zahlungsart": "firma",
+    }
+    record.update(fields)
+    return record
+
+
+def records(items):
+    """Liefert (Zeilennummer, Datensatz, Fehler) wie batch.read_records."""
+    for lineno, item in enumerate(items, start=1):
+        if isinstance(item, str):
+            yield lineno, None, item
+        else:
+            yield lineno, item, None
+
+
+class ParsedPdf:
+    """Minimaler Leser für die vom StreamingPdfWriter erzeugte Struktur."""
+
+    def __init__(self, data):
+        self.data = data
+        startxref = int(re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", data).group(1))
+        match = re.compile(rb"xref\s+0 (\d+)\s+").match(data, startxref)
+        self.size = int(match.group(1))
+        entries = data[match.end():match.end() + 20 * self.size].split(b"\n")
+        self.offsets = {}
+        for number, entry in enumerate(entries[:self.size]):
+            offset, _, kind = entry.split()
+            if kind == b"n":
+                self.offsets[number] = int(offset)
+        trailer = data[match.end() + 20 * self.size:]
+        self.trailer_size = int(re.search(rb"/Size (\d+)", trailer).group(1))
+        self.root = int(re.search(rb"/Root (\d+) 0 R", trailer).group(1))
+
+    def object(self, number):
+        offset = self.offsets[number]
+        end = self.data.index(b"endobj", offset)
+        return self.data[offset:end]
+
+    def ref(self, number, key):
+        return int(re.search(rb"/" + key + rb" (\d+) 0 R", self.object(number)).group(1))
+
+    def page_objects(self):
+        pages = self.ref(self.root, b"Pages")
+        kids = re.search(rb"/Kids \[([^\]]*)\]", self.object(pages)).group(1)
+        return [int(n) for n in re.findall(rb"(\d+) 0 R", kids)]
+
+    def outline_titles(self):
+        root = self.ref(self.root, b"Outlines")
+        titles, number = [], self.ref(root, b"First")
+        while True:
+            body = self.object(number)
+            hex_title = re.search(rb"/Title <FEFF([0-9A-F]*)>", body).group(1)
+            titles.append(bytes.fromhex(hex_title.decode("ascii")).decode("utf-16-be"))
+            following = re.search(rb"/Next (\d+) 0 R", body)
+            if not following:
+                return titles
+            number = int(following.group(1))
+
+
+class WriteReportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.out = os.path.join(self.tmp.name, "bericht.pdf")
+
+    def render(self, items, title="Oktober 2025"):
+        rendered, failures = report.write_report(records(items), self.out, title)
+        with open(self.out, "rb") as f:
+            return rendered, failures, ParsedPdf(f.read())
+
+    def test_structure_of_a_small_report(self):
+        items = [
+            beleg(1, ort="Osteria del Parco"),
+            beleg(2, bewirtungsart="mitarbeiter"),
+            beleg(3, gesamtbetrag="12.50"),
+            "Ungültiges JSON",
+            beleg(4),
+        ]
+        rendered, failures, pdf = self.render(items)
+
+        self.assertEqual(rendered, 3)
+        self.assertEqual([lineno for lineno, _ in failures], [3, 4])
+
+        # Xref: jeder Eintrag zeigt auf den Beginn seines Objekts
+        self.assertEqual(pdf.trailer_size, pdf.size)
+        self.assertEqual(len(pdf.offsets), pdf.size - 1)
+        for number, offset in pdf.offsets.items():
+            self.assertTrue(pdf.data.startswith(f"{number} 0 obj".encode("ascii"), offset), number)
+
+        # Übersicht + ein Verzeichnisblatt + drei Belege
+        pages = pdf.page_objects()
+        self.assertEqual(len(pages), 5)
+        count = int(re.search(rb"/Count (\d+)", pdf.object(pdf.ref(pdf.root, b"Pages"))).group(1))
+        self.assertEqual(count, 5)
+        for page in pages:
+            self.assertIn(b"/Type /Page ", pdf.object(page))
+
+        self.assertEqual(pdf.outline_titles(), [
+            "Übersicht",
+            "Belegverzeichnis",
+            "01.10.2025 – Osteria del Parco",
+            "02.10.2025 – Berlin",
+            "04.10.2025 – Berlin",
+        ])
+        outline_count = int(re.search(rb"/Count (\d+)", pdf.object(pdf.ref(pdf.root, b"Outlines"))).group(1))
+        self.assertEqual(outline_count, 5)
+
+    def test_index_spans_several_pages(self):
+        items = [beleg(1 + i % 28) for i in range(report.INDEX_ROWS + 1)]
+        rendered, _, pdf = self.render(items)
+
+        self.assertEqual(rendered, report.INDEX_ROWS + 1)
+        self.assertEqual(len(pdf.page_objects()), 1 + 2 + rendered)
+        titles = pdf.outline_titles()
+        self.assertEqual(titles[:2], ["Übersicht", "Belegverzeichnis"])
+        self.assertEqual(len(titles), 2 + rendered)
+
+    def test_totals_use_the_printed_amounts(self):
+        drawn = []
+        original = report._draw_summary
+
+        def capture_summary(c, title, totals, counts, failed):
+            drawn.append((totals, counts))
+            original(c, title, totals, counts, failed)
+
+        report._draw_summary = capture_summary
+        self.addCleanup(setattr, report, "_draw_summary", original)
+        self.render([beleg(1, gesamtbetrag="1.234,5"), beleg(2, gesamtbetrag=10)])
+
+        totals, counts = drawn[0]
+        self.assertEqual(counts["kunden"], 2)
+        self.assertEqual(str(totals["kunden"]["gesamtbetrag"]), "1244.50")
+
+    def test_invalid_amounts_are_failures(self):
+        rendered, failures, _ = self.render([
+            beleg(1, gesamtbetrag=True),
+            beleg(2, gesamtbetrag=float("inf")),
+            beleg(3, gesamtbetrag="123.45"),
+            beleg(4),
+        ])
+        self.assertEqual(rendered, 1)
+        self.assertEqual([lineno for lineno, _ in failures], [1, 2, 3])
+
+    def test_aborted_report_leaves_no_file(self):
+        def broken():
+            yield 1, beleg(1), None
+            raise RuntimeError("Abbruch")
+
+        with self.assertRaises(RuntimeError):
+            report.write_report(broken(), self.out)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+class PageRendererTest(unittest.TestCase):
+    def test_unsupported_resources_are_rejected(self):
+        renderer = report.PageRenderer()
+        renderer.capture(template.draw_form)
+        self.assertIn("Helvetica", renderer.fonts())
+
+        def transparent(c):
+            c.setFillAlpha(0.5)
+            c.rect(0, 0, 10, 10, fill=1)
+
+        renderer.capture(transparent)
+        with self.assertRaisesRegex(ValueError, "ExtGState"):
+            renderer.fonts()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Langlebiger Render-Worker für Bewirtungsformulare.
+
+Der Worker lädt reportlab, Schriften und das Logo einmal beim Start und
+beantwortet danach Aufträge im zeilenweisen JSON-Protokoll, entweder über
+stdin/stdout oder über einen lokalen Socket.
+
+Anfrage (eine Zeile):
+    {"id": 1, "record": {...}}                 ausgefüllter Beleg
+    {"id": 2, "bewirtungsart": "mitarbeiter"}  leeres Formular
+    {"id": 3, "op": "ping"}
+    {"id": 4, "op": "stats"}                   Cache-Zähler (und Abschnittszeiten)
+
+Antwort (eine Zeile):
+    {"id": 1, "ok": true, "pdf": "<base64>", "ms": 4.2, "cached": "memory"}
+    {"id": 1, "ok": false, "error": "..."}
+
+Verwendung:
+    python worker.py                       # stdin/stdout
+    python worker.py --socket /tmp/bewirtung.sock
+    python worker.py --port 8765           # nur 127.0.0.1
+    python worker.py --cache-dir .render-cache --cache-disk-mb 256
+    python worker.py --instrument --metrics-file render.prom
+"""
+import argparse
+import base64
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+import template
+from cache import RenderCache, render_cached
+from instrumentation import RenderStats
+
+# reportlab ist nicht für parallele Nutzung ausgelegt
+_render_lock = threading.Lock()
+_cache = RenderCache()
+_stats = None  # RenderStats, wenn mit --instrument gestartet
+_metrics_file = None
+
+
+def handle_request(line):
+    """Verarbeitet eine Anfragezeile und liefert das Antwortobjekt."""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"id": None, "ok": False, "error": f"Ungültiges JSON: {e}"}
+    if not isinstance(request, dict):
+        return {"id": None, "ok": False, "error": "Anfrage muss ein JSON-Objekt sein"}
+
+    request_id = request.get("id")
+    op = request.get("op", "render")
+    if op == "ping":
+        return {"id": request_id, "ok": True}
+    if op == "stats":
+        response = {"id": request_id, "ok": True, "cache": _cache.snapshot()}
+        if _stats is not None:
+            response["render"] = _stats.to_dict()
+            if _metrics_file:
+                _stats.write_prometheus(_metrics_file)
+        return response
+    if op != "render":
+        return {"id": request_id, "ok": False, "error": f"Unbekannte Operation: {op}"}
+
+    started = time.perf_counter()
+    try:
+        with _render_lock:
+            pdf, tier = render_cached(
+                _cache, request.get("record"), request.get("bewirtungsart", "kunden"), _stats
+            )
+    except Exception as e:
+        return {"id": request_id, "ok": False, "error": str(e)}
+    return {
+        "id": request_id,
+        "ok": True,
+        "pdf": base64.b64encode(pdf).decode("ascii"),
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+        "cached": tier,
+    }
+
+
+def serve_lines(reader, writer):
+    """Beantwortet Anfragen zeilenweise, bis der Eingabestrom endet."""
+    for line in reader:
+        if not line.strip():
+            continue
+        response = handle_request(line)
+        writer.write(json.dumps(response) + "\n")
+        writer.flush()
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            response = handle_request(raw.decode("utf-8"))
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render-Worker für Bewirtungsformulare.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--socket", help="Pfad eines Unix-Sockets, auf dem gelauscht wird")
+    group.add_argument("--port", type=int, help="TCP-Port auf 127.0.0.1, auf dem gelauscht wird")
+    parser.add_argument("--cache-dir", help="Verzeichnis für den Platten-Cache (ohne: nur Speicher)")
+    parser.add_argument("--cache-memory-mb", type=int, default=32, help="Obergrenze des Speicher-Caches")
+    parser.add_argument("--cache-disk-mb", type=int, default=512, help="Obergrenze des Platten-Caches")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Erfasst Dauer und Operationen je Formularabschnitt")
+    parser.add_argument("--metrics-file",
+                        help="Schreibt die Abschnittszeiten bei jeder 'stats'-Anfrage im Prometheus-Format")
+    args = parser.parse_args()
+
+    global _cache, _stats, _metrics_file
+    if args.instrument or args.metrics_file:
+        _stats = RenderStats()
+        _metrics_file = args.metrics_file
+    _cache = RenderCache(
+        args.cache_dir,
+        max_memory_bytes=args.cache_memory_mb * 1024 * 1024,
+        max_disk_bytes=args.cache_disk_mb * 1024 * 1024,
+    )
+    template.warm_up()
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = _UnixServer(args.socket, _LineHandler)
+        print(f"Worker bereit auf {args.socket}", file=sys.stderr)
+    elif args.port:
+        server = _TCPServer(("127.0.0.1", args.port), _LineHandler)
+        print(f"Worker bereit auf 127.0.0.1:{args.port}", file=sys.stderr)
+    else:
+        print("Worker bereit auf stdin/stdout", file=sys.stderr)
+        serve_lines(sys.stdin, sys.stdout)
+        return
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 'use client';
 
-import { Container, Title, Text, Paper, Stack, Button, Loader, Center, Image, Group, Avatar } from '@mantine/core';
+import { Container, Title, Text, Paper, Stack, Button, Loader, Center, Image, Group, Avatar, TextInput } from '@mantine/core';
 import Link from 'next/link';
-import { useEffect, useState } from 'react';
-import { IconGitCommit } from '@tabler/icons-react';
+import { useEffect, useRef, useState } from 'react';
+import { IconGitCommit, IconSearch } from '@tabler/icons-react';
 import { Chrono } from 'react-chrono';
 
 interface ReleaseNote {
@@ -12,27 +12,135 @@ interface ReleaseNote {
   changes: string[];
   build: string;
   commit: string;
+  id: number;
+}
+
+interface ReleaseNotesIndex {
+  latest: string | null;
+  total: number;
+  latestFile: string;
+  latestCount: number;
+  years: { year: string; count: number; file: string; searchFile: string; firstId: number }[];
+}
+
+interface SearchIndex {
+  count: number;
+  tokens: Record<string, number[]>;
+}
+
+// Zusammengeführte Jahresabschnitte des Suchindex mit einmalig sortierten Tokens für die Präfixsuche
+interface LoadedSearchIndex {
+  tokens: Record<string, number[]>;
+  keys: string[];
+}
+
+function mergeSearchIndexes(shards: SearchIndex[]): LoadedSearchIndex {
+  const tokens: Record<string, number[]> = {};
+  for (const shard of shards) {
+    for (const [token, ids] of Object.entries(shard.tokens)) {
+      // Jahre belegen getrennte ID-Bereiche, die Listen bleiben ohne Duplikate
+      tokens[token] = tokens[token] ? tokens[token].concat(ids) : ids;
+    }
+  }
+  return { tokens, keys: Object.keys(tokens).sort() };
+}
+
+const VERSION_PATTERN = /^\d+(\.\d+)+$/;
+// Unicode-Wortzeichen, entspricht \w in Python
+const WORD_PATTERN = new RegExp('[\\p{L}\\p{N}_]+', 'gu');
+
+// Muss zur Tokenisierung in .github/release_manager.py passen
+function tokenizeQuery(query: string): string[] {
+  const tokens: string[] = [];
+  for (const word of query.toLowerCase().split(/\s+/)) {
+    if (VERSION_PATTERN.test(word)) {
+      tokens.push(word);
+    } else {
+      tokens.push(...(word.match(WORD_PATTERN) ?? []).filter(token => token.length >= 2));
+    }
+  }
+  return tokens;
+}
+
+// Erste Position in keys, deren Token nicht kleiner als token ist
+function lowerBound(keys: string[], token: string): number {
+  let low = 0;
+  let high = keys.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (keys[mid] < token) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+// IDs aller Versionen, die zu jedem Suchbegriff (als Präfix) ein Token enthalten
+function searchIds(index: LoadedSearchIndex, tokens: string[]): Set<number> {
+  const { keys } = index;
+  let result: Set<number> | null = null;
+  for (const token of tokens) {
+    const ids = new Set<number>();
+    // Alle Tokens mit diesem Präfix liegen im sortierten Array direkt hintereinander
+    for (let i = lowerBound(keys, token); i < keys.length && keys[i].startsWith(token); i++) {
+      index.tokens[keys[i]].forEach(id => ids.add(id));
+    }
+    result = result === null ? ids : new Set(Array.from(result).filter(id => ids.has(id)));
+    if (result.size === 0) break;
+  }
+  return result ?? new Set();
+}
+
+async function fetchJson<T>(path: string): Promise<T> {
+  const response = await fetch(`/release-notes/${path}`);
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+  return response.json();
+}
+
+async function fetchVersions(file: string): Promise<ReleaseNote[]> {
+  const data = await fetchJson<{ versions?: ReleaseNote[] }>(file);
+  if (!data.versions || !Array.isArray(data.versions)) {
+    throw new Error('Ungültiges Format der Release Notes');
+  }
+  return data.versions;
 }
 
 export default function ReleaseNotes() {
   const [releaseNotes, setReleaseNotes] = useState<ReleaseNote[]>([]);
+  const [index, setIndex] = useState<ReleaseNotesIndex | null>(null);
+  const [loadedYears, setLoadedYears] = useState<number>(0);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const [error, setError] = useState<string>('');
   const [loading, setLoading] = useState<boolean>(true);
+  const [query, setQuery] = useState<string>('');
+  const [searchResults, setSearchResults] = useState<ReleaseNote[] | null>(null);
+  const [searching, setSearching] = useState<boolean>(false);
+  const searchIndexRef = useRef<LoadedSearchIndex | null>(null);
+  const yearFilesRef = useRef<Map<string, ReleaseNote[]>>(new Map());
+
+  const loadYear = async (file: string) => {
+    const cached = yearFilesRef.current.get(file);
+    if (cached) return cached;
+    const versions = await fetchVersions(file);
+    yearFilesRef.current.set(file, versions);
+    return versions;
+  };
 
   useEffect(() => {
     const loadReleaseNotes = async () => {
       try {
         setLoading(true);
-        const response = await fetch('/release-notes.json');
-        if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        const data = await response.json();
-        if (!data.versions || !Array.isArray(data.versions)) {
+        // Zuerst nur Index und die neuesten Versionen laden
+        const data = await fetchJson<ReleaseNotesIndex>('index.json');
+        if (!Array.isArray(data.years)) {
           throw new Error('Ungültiges Format der Release Notes');
         }
-
-        setReleaseNotes(data.versions);
+        setIndex(data);
+        setReleaseNotes(await fetchVersions(data.latestFile));
       } catch (error) {
         console.error('Fehler beim Laden der Release Notes:', error);
         setError('Release Notes konnten nicht geladen werden. Bitte versuchen Sie es später erneut.');
@@ -44,7 +152,72 @@ export default function ReleaseNotes() {
     loadReleaseNotes();
   }, []);
 
-  const items = releaseNotes.map(note => ({
+  const hasMore = !!index && releaseNotes.length < index.total && loadedYears < index.years.length;
+
+  const loadOlder = async () => {
+    if (!index || !hasMore) return;
+    try {
+      setLoadingMore(true);
+      // Jahresabschnitte nacheinander nachladen, neuestes Jahr zuerst
+      const versions = await loadYear(index.years[loadedYears].file);
+      setReleaseNotes(current => {
+        const known = new Set(current.map(note => note.id));
+        return [...current, ...versions.filter(note => !known.has(note.id))];
+      });
+      setLoadedYears(loadedYears + 1);
+    } catch (error) {
+      console.error('Fehler beim Laden älterer Release Notes:', error);
+      setError('Ältere Release Notes konnten nicht geladen werden.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  useEffect(() => {
+    const tokens = tokenizeQuery(query);
+    if (!index || tokens.length === 0) {
+      setSearchResults(null);
+      setSearching(false);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        setSearching(true);
+        // Suchindex erst bei der ersten Suche laden, danach nur noch Lookups
+        if (!searchIndexRef.current) {
+          const shards = await Promise.all(index.years.map(year => fetchJson<SearchIndex>(year.searchFile)));
+          searchIndexRef.current = mergeSearchIndexes(shards);
+        }
+        const ids = searchIds(searchIndexRef.current, tokens);
+        // Nur die Jahresabschnitte laden, in denen Treffer liegen
+        const years = index.years.filter(year =>
+          Array.from(ids).some(id => id >= year.firstId && id < year.firstId + year.count)
+        );
+        const chunks = await Promise.all(years.map(year => loadYear(year.file)));
+        if (!cancelled) {
+          setSearchResults(chunks.flat().filter(note => ids.has(note.id)).sort((a, b) => b.id - a.id));
+        }
+      } catch (error) {
+        console.error('Fehler bei der Suche in den Release Notes:', error);
+        if (!cancelled) setSearchResults([]);
+      } finally {
+        if (!cancelled) setSearching(false);
+      }
+    }, 200);
+
+    return () => {
+      // Eine abgelöste Suche setzt searching nicht mehr zurück, daher hier
+      cancelled = true;
+      clearTimeout(timer);
+      setSearching(false);
+    };
+  }, [query, index]);
+
+  const visibleNotes = searchResults ?? releaseNotes;
+
+  const items = visibleNotes.map(note => ({
     title: `Version ${note.version}`,
     cardTitle: `Version ${note.version}`,
     cardSubtitle: note.date,
@@ -96,6 +269,14 @@ export default function ReleaseNotes() {
           Zurück zur Startseite
         </Button>
 
+        <TextInput
+          placeholder="Release Notes durchsuchen, z.B. PDF oder 0.54"
+          leftSection={searching ? <Loader size="xs" /> : <IconSearch size={16} />}
+          value={query}
+          onChange={event => setQuery(event.currentTarget.value)}
+          disabled={loading || !!error}
+        />
+
         {loading ? (
           <Center>
             <Loader size="xl" />
@@ -104,9 +285,14 @@ export default function ReleaseNotes() {
           <Paper shadow="sm" p="xl" radius="md" withBorder>
             <Text c="red" ta="center">{error}</Text>
           </Paper>
+        ) : searchResults !== null && searchResults.length === 0 ? (
+          <Paper shadow="sm" p="xl" radius="md" withBorder>
+            <Text c="dimmed" ta="center">Keine Release Notes zu „{query}“ gefunden.</Text>
+          </Paper>
         ) : (
           <div style={{ width: '100%', minHeight: '70vh', height: '80vh', maxHeight: '90vh', display: 'flex', flexDirection: 'column', justifyContent: 'flex-start' }}>
             <Chrono
+              key={searchResults === null ? 'all' : query}
               items={items}
               mode="VERTICAL_ALTERNATING"
               theme={{
@@ -125,6 +311,13 @@ export default function ReleaseNotes() {
               useReadMore={false}
               style={{ flex: 1, minHeight: 0 }}
             />
+            {hasMore && searchResults === null && (
+              <Center mt="md">
+                <Button variant="light" onClick={loadOlder} loading={loadingMore}>
+                  Ältere Versionen laden
+                </Button>
+              </Center>
+            )}
           </div>
         )}
       </Stack>
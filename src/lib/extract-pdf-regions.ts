@@ -1,5 +1,6 @@
 import { BoundingBox } from './image-detection';
 import { convertPdfPageToImage } from './client-pdf-converter';
+import formFieldRegions from './form-field-regions.json';
 
 export interface ExtractedRegion {
   imageDataUrl: string;
@@ -112,6 +113,81 @@ export async function extractMultipleRegionsFromPdfPage(
   return extractedRegions;
 }
 
+export type FormVariant = keyof typeof formFieldRegions.variants;
+
+export interface FormFieldCrop {
+  field: string;
+  label: string;
+  imageDataUrl: string;
+  boundingBox: BoundingBox;
+}
+
+/**
+ * Version of the field region map generated by pdf-template/template.py --regions
+ */
+export const FORM_FIELD_REGIONS_VERSION = formFieldRegions.version;
+
+/**
+ * Crop the named field regions of a scanned Bewirtungsformular page.
+ * The page image must cover the whole A4 page; regions come from the
+ * template's layout so only small crops need to be sent to the vision model.
+ */
+export async function cropFormFieldRegions(
+  pageImageDataUrl: string,
+  variant: FormVariant,
+  fields?: string[],
+  padding = 0.005
+): Promise<FormFieldCrop[]> {
+  const regions: Record<string, { label: string; box: BoundingBox }> =
+    formFieldRegions.variants[variant].fields;
+  const names = fields ?? Object.keys(regions);
+
+  console.log(`✂️ Cropping ${names.length} form fields (${variant})`);
+
+  const img = await loadImage(pageImageDataUrl);
+  const crops: FormFieldCrop[] = [];
+
+  for (const name of names) {
+    const region = regions[name];
+    if (!region) {
+      console.warn(`⚠️ Unknown form field: ${name}`);
+      continue;
+    }
+
+    // Pad slightly to tolerate scan skew, but stay inside the page
+    const left = Math.max(0, region.box.x - padding);
+    const top = Math.max(0, region.box.y - padding);
+    const right = Math.min(1, region.box.x + region.box.width + padding);
+    const bottom = Math.min(1, region.box.y + region.box.height + padding);
+    const boundingBox = { x: left, y: top, width: right - left, height: bottom - top };
+
+    const x = Math.floor(boundingBox.x * img.width);
+    const y = Math.floor(boundingBox.y * img.height);
+    const width = Math.floor(boundingBox.width * img.width);
+    const height = Math.floor(boundingBox.height * img.height);
+
+    const canvas = document.createElement('canvas');
+    canvas.width = width;
+    canvas.height = height;
+    const ctx = canvas.getContext('2d');
+
+    if (!ctx) {
+      throw new Error('Failed to get canvas context');
+    }
+
+    ctx.drawImage(img, x, y, width, height, 0, 0, width, height);
+    crops.push({
+      field: name,
+      label: region.label,
+      imageDataUrl: canvas.toDataURL('image/jpeg', 0.95),
+      boundingBox
+    });
+  }
+
+  console.log(`✅ ${crops.length} form fields cropped`);
+  return crops;
+}
+
 /**
  * Helper function to load an image from a data URL
  */